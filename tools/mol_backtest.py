@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+MOL 5.2: БЭКТЕСТ И КАЛИБРОВКА ПОРОГОВ O(ℰ)
+Backtesting economic O(ℰ) against labelled crisis / non-crisis periods
+"""
+
+import csv
+
+import numpy as np
+
+from mol_economic_batch import COLLAPSE_THRESHOLD, CRISIS_THRESHOLD, batch_O_E
+
+
+def load_labelled_periods(path):
+    """Таблица периодов: country, start_year, end_year, crisis (1/0), необязательно note"""
+    periods = []
+    with open(path, 'r', encoding='utf-8', newline='') as file:
+        for row in csv.DictReader(file):
+            periods.append({
+                'country': row['country'].strip(),
+                'start_year': int(row['start_year']),
+                'end_year': int(row['end_year']),
+                'crisis': int(row['crisis']),
+                'note': (row.get('note') or '').strip(),
+            })
+    return periods
+
+
+def score_periods(panel, periods, rows, fdi_for_year=None):
+    """O(ℰ) всех периодов: один batch_O_E на каждое уникальное окно
+    
+    rows — строка панели для каждого периода (None, если страна не найдена);
+    fdi_for_year(year) — необязательный вектор FDI по строкам панели.
+    Возвращает массив O(ℰ), NaN для непосчитанных периодов.
+    """
+    scores = np.full(len(periods), np.nan)
+    windows = {}
+    for k, (period, row) in enumerate(zip(periods, rows)):
+        if row is not None:
+            windows.setdefault((period['start_year'], period['end_year']), []).append((k, row))
+    for (start_year, end_year), members in windows.items():
+        fdi = fdi_for_year(end_year) if fdi_for_year is not None else None
+        O_E = batch_O_E(panel, start_year, end_year, fdi)['O_E']
+        ks, picks = zip(*members)
+        scores[list(ks)] = O_E[list(picks)]
+    return scores
+
+
+def threshold_curves(scores, labels):
+    """ROC и PR кривые за один проход по отсортированным оценкам
+    
+    Прогноз «кризис» — O(ℰ) > порога. Для каждой различной оценки порог
+    берётся посередине до следующей меньшей, так что правило «>» даёт ровно
+    эту точку кривой. Периоды без оценки (NaN) не участвуют.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    labels = np.asarray(labels, dtype=bool)
+    keep = ~np.isnan(scores)
+    scores, labels = scores[keep], labels[keep]
+    positives, negatives = int(labels.sum()), int((~labels).sum())
+    
+    order = np.argsort(-scores, kind='stable')
+    scores, labels = scores[order], labels[order]
+    last_of_tie = np.append(np.nonzero(np.diff(scores))[0], len(scores) - 1)
+    tp = np.cumsum(labels)[last_of_tie]
+    fp = np.cumsum(~labels)[last_of_tie]
+    below = np.append(scores[last_of_tie[:-1] + 1], -np.inf) if len(scores) else np.empty(0)
+    thresholds = np.where(np.isfinite(below), (scores[last_of_tie] + below) / 2, scores[last_of_tie] - 1)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tpr = tp / positives if positives else np.zeros(len(tp))
+        fpr = fp / negatives if negatives else np.zeros(len(fp))
+        precision = tp / (tp + fp)
+    roc_x, roc_y = np.append(0.0, fpr), np.append(0.0, tpr)
+    recall_steps = np.diff(np.append(0.0, tpr))
+    
+    return {
+        'thresholds': thresholds,
+        'tp': tp, 'fp': fp,
+        'tpr': tpr, 'fpr': fpr,
+        'precision': precision, 'recall': tpr,
+        'roc_auc': float(np.sum(np.diff(roc_x) * (roc_y[1:] + roc_y[:-1]) / 2))
+                   if positives and negatives else float('nan'),
+        'average_precision': float(np.sum(recall_steps * precision)) if positives else float('nan'),
+        'positives': positives,
+        'negatives': negatives,
+    }
+
+
+def best_thresholds(curves):
+    """Лучшие пороги по индексу Юдена (TPR − FPR) и по F1"""
+    if not len(curves['thresholds']):
+        return {}
+    youden = curves['tpr'] - curves['fpr']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        f1 = 2 * curves['precision'] * curves['recall'] / (curves['precision'] + curves['recall'])
+    f1 = np.nan_to_num(f1)
+    best = {}
+    for name, metric in (('youden', youden), ('f1', f1)):
+        k = int(np.argmax(metric))
+        best[name] = {'threshold': float(curves['thresholds'][k]), 'value': float(metric[k]),
+                      'tpr': float(curves['tpr'][k]), 'fpr': float(curves['fpr'][k]),
+                      'precision': float(np.nan_to_num(curves['precision'][k]))}
+    return best
+
+
+def confusion_at(scores, labels, threshold):
+    """Матрица ошибок для правила O(ℰ) > threshold по посчитанным периодам"""
+    scores = np.asarray(scores, dtype=np.float64)
+    labels = np.asarray(labels, dtype=bool)
+    keep = ~np.isnan(scores)
+    predicted = scores[keep] > threshold
+    actual = labels[keep]
+    return {
+        'tp': int((predicted & actual).sum()), 'fp': int((predicted & ~actual).sum()),
+        'fn': int((~predicted & actual).sum()), 'tn': int((~predicted & ~actual).sum()),
+    }
+
+
+def backtest(panel, periods, rows, fdi_for_year=None):
+    """Оценить все периоды, построить кривые и подобрать пороги"""
+    scores = score_periods(panel, periods, rows, fdi_for_year)
+    labels = np.array([p['crisis'] for p in periods], dtype=bool)
+    curves = threshold_curves(scores, labels)
+    return {
+        'scores': scores,
+        'labels': labels,
+        'curves': curves,
+        'best': best_thresholds(curves),
+        'current': {threshold: confusion_at(scores, labels, threshold)
+                    for threshold in (CRISIS_THRESHOLD, COLLAPSE_THRESHOLD)},
+        'unscored': [p for p, s in zip(periods, scores) if np.isnan(s)],
+    }
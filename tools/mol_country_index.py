@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+MOL 5.2: ИНДЕКС СТРАН И ISO-КОДОВ
+Normalized country index: names, aliases and ISO2/ISO3 codes -> panel rows
+"""
+
+import re
+import unicodedata
+
+# ISO3|ISO2|название|псевдонимы через ";" (варианты World Bank, IMF, UN и разговорные)
+COUNTRY_TABLE = """
+AFG|AF|Afghanistan|Islamic Republic of Afghanistan;Afghanistan, Islamic Rep.;Afghanistan, Islamic Rep. of
+ALB|AL|Albania|
+DZA|DZ|Algeria|
+ASM|AS|American Samoa|
+AND|AD|Andorra|Andorra, Principality of
+AGO|AO|Angola|
+ATG|AG|Antigua and Barbuda|
+ARG|AR|Argentina|
+ARM|AM|Armenia|Armenia, Republic of;Armenia, Rep. of
+ABW|AW|Aruba|Aruba, Kingdom of the Netherlands
+AUS|AU|Australia|
+AUT|AT|Austria|
+AZE|AZ|Azerbaijan|Azerbaijan, Republic of;Azerbaijan, Rep. of
+BHS|BS|Bahamas|Bahamas, The;The Bahamas
+BHR|BH|Bahrain|Bahrain, Kingdom of
+BGD|BD|Bangladesh|
+BRB|BB|Barbados|
+BLR|BY|Belarus|Belarus, Republic of;Belarus, Rep. of
+BEL|BE|Belgium|
+BLZ|BZ|Belize|
+BEN|BJ|Benin|
+BMU|BM|Bermuda|
+BTN|BT|Bhutan|
+BOL|BO|Bolivia|Plurinational State of Bolivia;Bolivia (Plurinational State of)
+BIH|BA|Bosnia and Herzegovina|Bosnia-Herzegovina
+BWA|BW|Botswana|
+BRA|BR|Brazil|
+VGB|VG|British Virgin Islands|Virgin Islands, British
+BRN|BN|Brunei Darussalam|Brunei
+BGR|BG|Bulgaria|
+BFA|BF|Burkina Faso|
+BDI|BI|Burundi|
+CPV|CV|Cabo Verde|Cape Verde
+KHM|KH|Cambodia|
+CMR|CM|Cameroon|
+CAN|CA|Canada|
+CYM|KY|Cayman Islands|
+CAF|CF|Central African Republic|Central African Rep.;CAR
+TCD|TD|Chad|
+CHI|JG|Channel Islands|
+CHL|CL|Chile|
+CHN|CN|China|People's Republic of China;China, People's Republic of;PRC;Mainland China;China, P.R.: Mainland;China, People's Rep. of
+COL|CO|Colombia|
+COM|KM|Comoros|
+COD|CD|Congo, Dem. Rep.|Democratic Republic of the Congo;Congo, Democratic Republic of the;DR Congo;DRC;Congo (Kinshasa);Zaire;Congo, Dem. Rep. of the;Congo, Democratic Rep. of the
+COG|CG|Congo, Rep.|Republic of the Congo;Congo, Republic of;Congo (Brazzaville);Congo, Rep. of;Congo, Republic of the
+CRI|CR|Costa Rica|
+CIV|CI|Cote d'Ivoire|Côte d'Ivoire;Ivory Coast
+HRV|HR|Croatia|Croatia, Republic of;Croatia, Rep. of
+CUB|CU|Cuba|
+CUW|CW|Curacao|Curaçao;Curaçao, Kingdom of the Netherlands
+CYP|CY|Cyprus|
+CZE|CZ|Czechia|Czech Republic;Czech Rep.
+DNK|DK|Denmark|
+DJI|DJ|Djibouti|
+DMA|DM|Dominica|
+DOM|DO|Dominican Republic|Dominican Rep.
+ECU|EC|Ecuador|
+EGY|EG|Egypt|Egypt, Arab Rep.;Arab Republic of Egypt;Egypt, Arab Rep. of
+SLV|SV|El Salvador|
+GNQ|GQ|Equatorial Guinea|Equatorial Guinea, Rep. of
+ERI|ER|Eritrea|Eritrea, The State of
+EST|EE|Estonia|Estonia, Republic of;Estonia, Rep. of
+SWZ|SZ|Eswatini|Swaziland;Kingdom of Eswatini;Eswatini, Kingdom of
+ETH|ET|Ethiopia|Ethiopia, The Federal Dem. Rep. of;Federal Democratic Republic of Ethiopia
+FRO|FO|Faroe Islands|Faeroe Islands
+FJI|FJ|Fiji|Fiji, Republic of;Fiji, Rep. of
+FIN|FI|Finland|
+FRA|FR|France|
+PYF|PF|French Polynesia|
+GAB|GA|Gabon|
+GMB|GM|Gambia|Gambia, The;The Gambia
+GEO|GE|Georgia|
+DEU|DE|Germany|Federal Republic of Germany
+GHA|GH|Ghana|
+GIB|GI|Gibraltar|
+GRC|GR|Greece|Hellenic Republic
+GRL|GL|Greenland|
+GRD|GD|Grenada|
+GUM|GU|Guam|
+GTM|GT|Guatemala|
+GIN|GN|Guinea|
+GNB|GW|Guinea-Bissau|
+GUY|GY|Guyana|
+HTI|HT|Haiti|
+HND|HN|Honduras|
+HKG|HK|Hong Kong SAR, China|Hong Kong;Hong Kong SAR;China, Hong Kong SAR;China, P.R.: Hong Kong;Hong Kong Special Administrative Region, People's Republic of China
+HUN|HU|Hungary|
+ISL|IS|Iceland|
+IND|IN|India|
+IDN|ID|Indonesia|
+IRN|IR|Iran, Islamic Rep.|Iran;Islamic Republic of Iran;Iran (Islamic Republic of);Iran, Islamic Rep. of;Iran, Islamic Republic of
+IRQ|IQ|Iraq|
+IRL|IE|Ireland|
+IMN|IM|Isle of Man|
+ISR|IL|Israel|
+ITA|IT|Italy|
+JAM|JM|Jamaica|
+JPN|JP|Japan|
+JOR|JO|Jordan|
+KAZ|KZ|Kazakhstan|Kazakhstan, Republic of;Kazakhstan, Rep. of
+KEN|KE|Kenya|
+KIR|KI|Kiribati|
+PRK|KP|Korea, Dem. People's Rep.|North Korea;Democratic People's Republic of Korea;Korea, Democratic People's Republic of;DPRK;Korea, North;Korea, Dem. People's Rep. of
+KOR|KR|Korea, Rep.|South Korea;Republic of Korea;Korea, Republic of;Korea, South;Korea, Rep. of
+XKX|XK|Kosovo|Kosovo, Republic of;Kosovo, Rep. of
+KWT|KW|Kuwait|
+KGZ|KG|Kyrgyz Republic|Kyrgyzstan;Kyrgyz Rep.
+LAO|LA|Lao PDR|Laos;Lao People's Democratic Republic;Lao People's Dem. Rep.;Lao P.D.R.
+LVA|LV|Latvia|
+LBN|LB|Lebanon|
+LSO|LS|Lesotho|Lesotho, Kingdom of
+LBR|LR|Liberia|
+LBY|LY|Libya|
+LIE|LI|Liechtenstein|
+LTU|LT|Lithuania|
+LUX|LU|Luxembourg|
+MAC|MO|Macao SAR, China|Macao;Macau;Macao SAR;China, Macao SAR;China, P.R.: Macao;Macao Special Administrative Region, People's Republic of China
+MDG|MG|Madagascar|Madagascar, Republic of;Madagascar, Rep. of
+MWI|MW|Malawi|
+MYS|MY|Malaysia|
+MDV|MV|Maldives|
+MLI|ML|Mali|
+MLT|MT|Malta|
+MHL|MH|Marshall Islands|Marshall Islands, Rep. of the;Marshall Islands, Republic of the
+MRT|MR|Mauritania|Mauritania, Islamic Rep. of;Islamic Republic of Mauritania
+MUS|MU|Mauritius|
+MEX|MX|Mexico|
+FSM|FM|Micronesia, Fed. Sts.|Micronesia;Federated States of Micronesia;Micronesia (Federated States of);Micronesia, Fed. States of;Micronesia, Federated States of
+MDA|MD|Moldova|Republic of Moldova;Moldova, Republic of;Moldova, Rep. of
+MCO|MC|Monaco|
+MNG|MN|Mongolia|
+MNE|ME|Montenegro|
+MAR|MA|Morocco|
+MOZ|MZ|Mozambique|Mozambique, Republic of;Mozambique, Rep. of
+MMR|MM|Myanmar|Burma
+NAM|NA|Namibia|
+NRU|NR|Nauru|Nauru, Republic of;Nauru, Rep. of
+NPL|NP|Nepal|
+NLD|NL|Netherlands|The Netherlands;Holland;Kingdom of the Netherlands;Netherlands, The
+NCL|NC|New Caledonia|
+NZL|NZ|New Zealand|
+NIC|NI|Nicaragua|
+NER|NE|Niger|
+NGA|NG|Nigeria|
+MKD|MK|North Macedonia|Macedonia;Macedonia, FYR;FYR Macedonia;Republic of North Macedonia;North Macedonia, Republic of;North Macedonia, Rep. of
+MNP|MP|Northern Mariana Islands|
+NOR|NO|Norway|
+OMN|OM|Oman|
+PAK|PK|Pakistan|
+PLW|PW|Palau|Palau, Republic of;Palau, Rep. of
+MAF|MF|St. Martin (French part)|Saint Martin;Saint-Martin;Saint Martin (French part)
+VIR|VI|Virgin Islands (U.S.)|U.S. Virgin Islands;United States Virgin Islands;Virgin Islands, U.S.
+PSE|PS|West Bank and Gaza|Palestine;State of Palestine;West Bank and Gaza Strip
+PAN|PA|Panama|
+PNG|PG|Papua New Guinea|
+PRY|PY|Paraguay|
+PER|PE|Peru|
+PHL|PH|Philippines|
+POL|PL|Poland|Poland, Republic of;Poland, Rep. of
+PRT|PT|Portugal|
+PRI|PR|Puerto Rico|
+QAT|QA|Qatar|
+ROU|RO|Romania|
+RUS|RU|Russian Federation|Russia
+RWA|RW|Rwanda|
+WSM|WS|Samoa|
+SMR|SM|San Marino|San Marino, Republic of;San Marino, Rep. of
+STP|ST|Sao Tome and Principe|São Tomé and Príncipe;Sao Tome and Principe, Dem. Rep. of
+SAU|SA|Saudi Arabia|
+SEN|SN|Senegal|
+SRB|RS|Serbia|Serbia, Republic of;Serbia, Rep. of
+SYC|SC|Seychelles|
+SLE|SL|Sierra Leone|
+SGP|SG|Singapore|
+SXM|SX|Sint Maarten (Dutch part)|Sint Maarten;Sint Maarten, Kingdom of the Netherlands
+SVK|SK|Slovak Republic|Slovakia;Slovak Rep.
+SVN|SI|Slovenia|Slovenia, Republic of;Slovenia, Rep. of
+SLB|SB|Solomon Islands|
+SOM|SO|Somalia|
+ZAF|ZA|South Africa|
+SSD|SS|South Sudan|South Sudan, Republic of;South Sudan, Rep. of;Republic of South Sudan
+ESP|ES|Spain|
+LKA|LK|Sri Lanka|
+KNA|KN|St. Kitts and Nevis|Saint Kitts and Nevis
+LCA|LC|St. Lucia|Saint Lucia
+VCT|VC|St. Vincent and the Grenadines|Saint Vincent and the Grenadines
+SDN|SD|Sudan|
+SUR|SR|Suriname|
+SWE|SE|Sweden|
+CHE|CH|Switzerland|
+SYR|SY|Syrian Arab Republic|Syria;Syrian Arab Rep.
+TWN|TW|Taiwan|Taiwan, China;Taiwan Province of China;Chinese Taipei
+TJK|TJ|Tajikistan|Tajikistan, Republic of;Tajikistan, Rep. of
+TZA|TZ|Tanzania|United Republic of Tanzania;Tanzania, United Rep. of;Tanzania, United Republic of
+THA|TH|Thailand|
+TLS|TL|Timor-Leste|East Timor;Timor-Leste, Dem. Rep. of
+TGO|TG|Togo|
+TON|TO|Tonga|
+TTO|TT|Trinidad and Tobago|
+TUN|TN|Tunisia|
+TUR|TR|Turkiye|Turkey;Türkiye;Republic of Türkiye;Türkiye, Republic of;Türkiye, Rep. of;Turkey, Republic of
+TKM|TM|Turkmenistan|
+TCA|TC|Turks and Caicos Islands|
+TUV|TV|Tuvalu|
+UGA|UG|Uganda|
+UKR|UA|Ukraine|
+ARE|AE|United Arab Emirates|UAE
+GBR|GB|United Kingdom|UK;Great Britain;Britain;United Kingdom of Great Britain and Northern Ireland
+USA|US|United States|United States of America;USA;US;U.S.;America
+URY|UY|Uruguay|
+UZB|UZ|Uzbekistan|Uzbekistan, Republic of;Uzbekistan, Rep. of
+VUT|VU|Vanuatu|
+VEN|VE|Venezuela, RB|Venezuela;Bolivarian Republic of Venezuela;Venezuela (Bolivarian Republic of);Venezuela, República Bolivariana de
+VNM|VN|Viet Nam|Vietnam
+YEM|YE|Yemen, Rep.|Yemen;Republic of Yemen;Yemen, Rep. of;Yemen, Republic of
+ZMB|ZM|Zambia|
+ZWE|ZW|Zimbabwe|
+"""
+
+
+def normalize_name(name):
+    """Ключ поиска: без диакритики, регистра, пунктуации, артикля "the" и лишних пробелов"""
+    text = unicodedata.normalize('NFKD', str(name))
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    text = text.replace('&', ' and ').replace("'", '').replace('.', '')
+    text = re.sub(r'[^a-z0-9]+', ' ', text).strip()
+    return re.sub(r'^the ', '', text)
+
+
+def _country_table():
+    """{нормализованный ключ: ISO3} для названий, псевдонимов и кодов"""
+    keys, iso2_of = {}, {}
+    for line in COUNTRY_TABLE.strip().splitlines():
+        iso3, iso2, name, aliases = line.split('|')
+        iso2_of[iso3] = iso2
+        for key in [iso3, iso2, name] + [a for a in aliases.split(';') if a]:
+            keys.setdefault(normalize_name(key), iso3)
+    return keys, iso2_of
+
+
+COUNTRY_KEYS, ISO2_OF = _country_table()
+
+
+def resolve_iso3(name):
+    """ISO3 по названию, псевдониму или коду; None для неизвестных и неоднозначных (например, "Korea")"""
+    return COUNTRY_KEYS.get(normalize_name(name))
+
+
+class CountryIndex:
+    """Нормализованный индекс: название / псевдоним / ISO2 / ISO3 → строка панели за O(1)
+
+    Строится один раз при загрузке. Каждой строке с распознанной страной
+    соответствуют все её псевдонимы и коды; нераспознанные строки (агрегаты
+    вроде "World") доступны по своему названию.
+    """
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.iso3 = [resolve_iso3(name) for name in self.names]
+        self.row_of = {}
+        for row, name in enumerate(self.names):
+            self.row_of.setdefault(normalize_name(name), row)
+        by_iso3 = {}
+        for row, iso3 in enumerate(self.iso3):
+            if iso3:
+                by_iso3.setdefault(iso3, row)
+        for key, iso3 in COUNTRY_KEYS.items():
+            if iso3 in by_iso3:
+                self.row_of.setdefault(key, by_iso3[iso3])
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return normalize_name(name) in self.row_of
+
+    def row(self, name):
+        """Строка панели или None"""
+        return self.row_of.get(normalize_name(name))
+
+    def iso3_of(self, name):
+        """ISO3 страны по любому из её названий или кодов"""
+        row = self.row(name)
+        return self.iso3[row] if row is not None else resolve_iso3(name)
+
+    def iso2_of(self, name):
+        iso3 = self.iso3_of(name)
+        return ISO2_OF.get(iso3) if iso3 else None
+
+    def unresolved(self):
+        """Названия панели без ISO-кода"""
+        return [name for name, iso3 in zip(self.names, self.iso3) if iso3 is None]
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+MOL 5.2: ПАКЕТНЫЙ РАСЧЁТ O(ℰ) ДЛЯ ВСЕХ СТРАН
+Vectorized calculate_safe_O_E over the GDP panel
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Те же правила, что и в MOLEconomicAnalyzer.calculate_safe_O_E
+MIN_GDP_POINTS = 5
+MIN_GROWTH_POINTS = 4
+SHARP_DECLINE = -0.05
+DEFAULT_FDI_DEPENDENCE = 0.3
+VOLATILITY_WEIGHT = 20
+DECLINE_WEIGHT = 15
+MEAN_GROWTH_WEIGHT = 5
+FDI_WEIGHT = 8
+CRISIS_WEIGHT = 10
+O_E_MAX = 100
+CRISIS_THRESHOLD = 15
+COLLAPSE_THRESHOLD = 25
+BOOTSTRAP_RESAMPLES = 2000
+BOOTSTRAP_CHUNK = 32  # строк на задачу; от числа процессов результат не зависит
+
+
+def crisis_factors(years):
+    """Глобальная нагрузка по годам: 2008-09 → 0.8, 2020-21 → 0.6, с 2022 → 0.7"""
+    years = np.asarray(years)
+    return np.select([(years >= 2008) & (years <= 2009), (years >= 2020) & (years <= 2021), years >= 2022],
+                     [0.8, 0.6, 0.7], 0.0)
+
+
+def growth_matrix(values):
+    """Темпы роста между соседними известными значениями каждой строки
+    
+    Пропуски (NaN) сжимаются, как в скалярной версии: рост считается от
+    предыдущего известного года. Пары с нулевым ВВП дают NaN.
+    Возвращает (рост, маска роста, маска известных значений, столбец последнего значения).
+    """
+    valid = ~np.isnan(values)
+    n, length = values.shape
+    last = np.maximum.accumulate(np.where(valid, np.arange(length), -1), axis=1)
+    prev_col = np.full((n, length), -1)
+    prev_col[:, 1:] = last[:, :-1]
+    prev = np.take_along_axis(values, np.maximum(prev_col, 0), axis=1)
+    ok = valid & (prev_col >= 0) & (prev != 0) & (values != 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = np.where(ok, (values - prev) / prev, np.nan)
+    return growth, ok, valid, last[:, -1] if length else np.full(n, -1)
+
+
+def batch_O_E(panel, start_year, end_year, fdi=None):
+    """O(ℰ) всех стран панели за окно start_year..end_year одним проходом NumPy
+    
+    fdi — необязательный массив прямых инвестиций за end_year по строкам панели
+    (NaN или 0 → значение по умолчанию 0.3). Результат — словарь массивов
+    длины len(panel); O_E равно NaN там, где данных недостаточно.
+    """
+    window = panel.window(start_year, end_year)
+    n = window.shape[0]
+    growth, ok, valid, last = growth_matrix(window)
+    gdp_points = valid.sum(axis=1)
+    points = ok.sum(axis=1)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_growth = np.where(ok, growth, 0.0).sum(axis=1) / points
+        deviation = np.where(ok, growth - mean_growth[:, None], 0.0)
+        volatility = np.where(points > 1, np.sqrt((deviation * deviation).sum(axis=1) / (points - 1)), 0.0)
+        decline_factor = (ok & (growth < SHARP_DECLINE)).sum(axis=1) / points
+    
+    gdp_last = np.full(n, np.nan)
+    if window.shape[1]:
+        gdp_last = np.where(last >= 0, window[np.arange(n), np.maximum(last, 0)], np.nan)
+    fdi = np.full(n, np.nan) if fdi is None else np.asarray(fdi, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        has_fdi = ~np.isnan(fdi) & (fdi != 0) & (gdp_last > 0)
+        fdi_dependence = np.where(has_fdi, np.clip(fdi / gdp_last, 0.0, 1.0), DEFAULT_FDI_DEPENDENCE)
+    
+    years = np.arange(start_year, end_year + 1)
+    crisis_pressure = crisis_factors(years).mean() if len(years) else 0.0
+    
+    O_E = (volatility * VOLATILITY_WEIGHT + decline_factor * DECLINE_WEIGHT
+           + np.abs(mean_growth) * MEAN_GROWTH_WEIGHT
+           + fdi_dependence * FDI_WEIGHT + crisis_pressure * CRISIS_WEIGHT)
+    eligible = (gdp_points >= MIN_GDP_POINTS) & (points >= MIN_GROWTH_POINTS)
+    O_E = np.where(eligible, np.clip(O_E, 0, O_E_MAX), np.nan)
+    
+    return {
+        'O_E': O_E,
+        'volatility': volatility,
+        'decline_factor': decline_factor,
+        'mean_growth': mean_growth,
+        'fdi_dependence': fdi_dependence,
+        'crisis_pressure': np.full(n, crisis_pressure),
+        'data_points': points,
+        'eligible': eligible,
+    }
+
+
+def _window_sums(prefix, lo, hi):
+    """Сумма элементов lo..hi-1 каждой строки по префиксным суммам (lo: n×S×1, hi: 1×1×E)"""
+    n = prefix.shape[0]
+    upper = prefix[:, hi.ravel()][:, None, :]
+    lower = np.take_along_axis(prefix, lo.reshape(n, -1), axis=1)[:, :, None]
+    return upper - lower
+
+
+def scan_all_windows(panel, fdi=None, min_length=MIN_GDP_POINTS):
+    """O(ℰ) каждой страны для каждого окна [start, end] лет панели длиной от min_length
+    
+    Окно стоит O(1): суммы роста, квадратов роста, числа падений, числа
+    известных значений и crisis_factor берутся как разности префиксных сумм.
+    Первый известный год окна не даёт роста (как в скалярной версии), поэтому
+    суммы роста начинаются со следующего после него столбца.
+    Для обычных рядов совпадает с batch_O_E до ~1e-13; при ростах порядка 1e5
+    (мусорные значения ВВП) разность префиксных сумм теряет точность.
+    fdi — необязательная матрица FDI (страны × годы панели).
+    Результат: O_E формы (страны, start, end) с NaN для коротких и пустых окон.
+    """
+    values = panel.values
+    n, length = values.shape
+    growth, ok, valid, _ = growth_matrix(values)
+    
+    # Центрирование по среднему страны снижает потерю точности в сумме квадратов
+    with np.errstate(invalid='ignore'):
+        center = np.where(ok, growth, 0.0).sum(axis=1) / np.maximum(ok.sum(axis=1), 1)
+    centered = np.where(ok, growth - center[:, None], 0.0)
+    
+    def prefix(a):
+        out = np.zeros((n, length + 1))
+        np.cumsum(a, axis=1, out=out[:, 1:])
+        return out
+    
+    P_points, P_sum, P_sq = prefix(ok), prefix(centered), prefix(centered * centered)
+    P_decline = prefix(ok & (growth < SHARP_DECLINE))
+    P_valid = prefix(valid)
+    
+    # Первый известный столбец не раньше start и последний не позже end
+    cols = np.arange(length)
+    first = np.minimum.accumulate(np.where(valid, cols, length)[:, ::-1], axis=1)[:, ::-1]
+    last = np.maximum.accumulate(np.where(valid, cols, -1), axis=1)
+    
+    start = cols[None, :, None]
+    end = cols[None, None, :]
+    growth_lo = np.minimum(first + 1, length)[:, :, None]
+    hi = end + 1
+    
+    gdp_points = _window_sums(P_valid, np.broadcast_to(start, (n, length, 1)), hi)
+    points = _window_sums(P_points, growth_lo, hi)
+    total = _window_sums(P_sum, growth_lo, hi)
+    squares = _window_sums(P_sq, growth_lo, hi)
+    declines = _window_sums(P_decline, growth_lo, hi)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        shifted_mean = total / points
+        mean_growth = shifted_mean + center[:, None, None]
+        variance = np.maximum(squares - points * shifted_mean * shifted_mean, 0.0) / (points - 1)
+        volatility = np.where(points > 1, np.sqrt(variance), 0.0)
+        decline_factor = declines / points
+    
+    gdp_last = np.take_along_axis(values, np.maximum(last, 0), axis=1)[:, None, :]
+    fdi = np.full((n, length), np.nan) if fdi is None else np.asarray(fdi, dtype=np.float64)
+    fdi_end = fdi[:, None, :]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        has_fdi = ~np.isnan(fdi_end) & (fdi_end != 0) & (gdp_last > 0)
+        fdi_dependence = np.where(has_fdi, np.clip(fdi_end / gdp_last, 0.0, 1.0), DEFAULT_FDI_DEPENDENCE)
+    
+    crisis = np.concatenate([[0.0], np.cumsum(crisis_factors(panel.years))])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        crisis_pressure = ((crisis[hi] - crisis[start]) / (end - start + 1))
+    
+    O_E = (volatility * VOLATILITY_WEIGHT + decline_factor * DECLINE_WEIGHT
+           + np.abs(mean_growth) * MEAN_GROWTH_WEIGHT
+           + fdi_dependence * FDI_WEIGHT + crisis_pressure * CRISIS_WEIGHT)
+    eligible = ((end - start + 1 >= min_length) & (gdp_points >= MIN_GDP_POINTS)
+                & (points >= MIN_GROWTH_POINTS))
+    return {
+        'O_E': np.where(eligible, np.clip(O_E, 0, O_E_MAX), np.nan),
+        'years': panel.years,
+        'min_length': min_length,
+    }
+
+
+def top_windows(scan, k=10):
+    """k окон с наибольшим O(ℰ): [(строка, start_year, end_year, O_E)]"""
+    O_E = scan['O_E']
+    flat = np.where(np.isnan(O_E), -np.inf, O_E).ravel()
+    k = min(k, int(np.isfinite(flat).sum()))
+    if not k:
+        return []
+    picks = np.argpartition(-flat, k - 1)[:k]
+    picks = picks[np.lexsort((picks, -flat[picks]))]
+    years = scan['years']
+    rows, starts, ends = np.unravel_index(picks, O_E.shape)
+    return [(int(r), int(years[s]), int(years[e]), float(O_E[r, s, e]))
+            for r, s, e in zip(rows, starts, ends)]
+
+
+
+def _bootstrap_chunk(growth, counts, base, seed, chunk, resamples, quantiles):
+    """Бутстрап O(ℰ) для блока стран: матрица индексов (страны × повторы × точки)
+
+    growth — сжатые темпы роста (первые counts[i] значений строки i),
+    base — не зависящая от выборки часть O(ℰ) (FDI и глобальная нагрузка).
+    Возвращает (квантили O(ℰ) формы (len(quantiles), строки), P(O(ℰ) > 15), P(O(ℰ) > 25)).
+    """
+    rng = np.random.default_rng([seed, chunk])
+    width = growth.shape[1]
+    m = counts[:, None, None]
+    index = (rng.random((len(counts), resamples, width)) * m).astype(np.int64)
+    sample = np.take_along_axis(growth[:, None, :], index, axis=2)
+    mask = np.arange(width)[None, None, :] < m
+    
+    mean_growth = np.where(mask, sample, 0.0).sum(axis=2) / m[:, :, 0]
+    deviation = np.where(mask, sample - mean_growth[:, :, None], 0.0)
+    volatility = np.sqrt((deviation * deviation).sum(axis=2) / (m[:, :, 0] - 1))
+    decline_factor = (mask & (sample < SHARP_DECLINE)).sum(axis=2) / m[:, :, 0]
+    O_E = np.clip(volatility * VOLATILITY_WEIGHT + decline_factor * DECLINE_WEIGHT
+                  + np.abs(mean_growth) * MEAN_GROWTH_WEIGHT + base[:, None], 0, O_E_MAX)
+    
+    return (np.percentile(O_E, quantiles, axis=1),
+            (O_E > CRISIS_THRESHOLD).mean(axis=1),
+            (O_E > COLLAPSE_THRESHOLD).mean(axis=1))
+
+
+def bootstrap_O_E(panel, start_year, end_year, fdi=None, resamples=BOOTSTRAP_RESAMPLES,
+                  confidence=0.95, seed=0, workers=1, rows=None):
+    """Бутстрап-интервалы O(ℰ) за окно: темпы роста каждой страны пересэмплируются с возвращением
+
+    FDI и глобальная нагрузка фиксированы, меняются волатильность, доля
+    падений и средний рост. Блоки по BOOTSTRAP_CHUNK стран при workers > 1
+    считаются в пуле процессов; у каждого блока свой поток случайных чисел,
+    поэтому результат зависит только от seed. rows ограничивает расчёт
+    подмножеством строк панели.
+    """
+    point = batch_O_E(panel, start_year, end_year, fdi)
+    n = len(panel)
+    rows = np.arange(n) if rows is None else np.asarray(rows, dtype=np.int64)
+    rows = rows[point['eligible'][rows]]
+    
+    growth, ok, _, _ = growth_matrix(panel.window(start_year, end_year))
+    order = np.argsort(~ok[rows], axis=1, kind='stable')
+    compact = np.nan_to_num(np.take_along_axis(growth[rows], order, axis=1))
+    counts = ok[rows].sum(axis=1)
+    base = (point['fdi_dependence'][rows] * FDI_WEIGHT + point['crisis_pressure'][rows] * CRISIS_WEIGHT)
+    tail = (1 - confidence) / 2 * 100
+    quantiles = [tail, 50, 100 - tail]
+    
+    tasks = [(compact[i:i + BOOTSTRAP_CHUNK], counts[i:i + BOOTSTRAP_CHUNK], base[i:i + BOOTSTRAP_CHUNK],
+              seed, i // BOOTSTRAP_CHUNK, resamples, quantiles)
+             for i in range(0, len(rows), BOOTSTRAP_CHUNK)]
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_bootstrap_chunk, *zip(*tasks)))
+    else:
+        parts = [_bootstrap_chunk(*task) for task in tasks]
+    
+    result = {key: np.full(n, np.nan) for key in ('low', 'median', 'high', 'p_crisis', 'p_collapse')}
+    if parts:
+        bounds = np.concatenate([p[0] for p in parts], axis=1)
+        result['low'][rows], result['median'][rows], result['high'][rows] = bounds
+        result['p_crisis'][rows] = np.concatenate([p[1] for p in parts])
+        result['p_collapse'][rows] = np.concatenate([p[2] for p in parts])
+    result.update(O_E=point['O_E'], data_points=point['data_points'],
+                  resamples=resamples, confidence=confidence)
+    return result
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+MOL 5.2: ПАНЕЛЬ ВВП СТРАНЫ × ГОДЫ
+Country x year GDP panel as a dense float64 NumPy matrix
+"""
+
+import csv
+import math
+import re
+from collections.abc import Mapping
+
+import numpy as np
+
+NAME_COLUMN = 'Country'
+MISSING_VALUES = {'', 'na', 'n/a', 'nan', 'null', 'none', '..', '-', '—'}
+_YEAR_COLUMN = re.compile(r'^\s*(\d{4})\s*$')
+
+
+def parse_number(text):
+    """Число из ячейки CSV: знак, экспонента и разделители тысяч допустимы; иначе NaN"""
+    if text is None:
+        return math.nan
+    text = text.strip().replace('\u00a0', '').replace(' ', '').replace('_', '')
+    if text.lower() in MISSING_VALUES:
+        return math.nan
+    if ',' in text and '.' not in text and re.fullmatch(r'-?\d{1,3}(,\d{3})+', text) is None:
+        text = text.replace(',', '.')  # десятичная запятая: "1234,5"
+    else:
+        text = text.replace(',', '')  # разделители тысяч: "1,234,567.8"
+    try:
+        return float(text)
+    except ValueError:
+        return math.nan
+
+
+class CountryRow(Mapping):
+    """Строка панели в старом формате {'name': ..., год: значение или None}"""
+    
+    def __init__(self, panel, row):
+        self.panel = panel
+        self.row = row
+    
+    def __getitem__(self, key):
+        if key == 'name':
+            return self.panel.names[self.row]
+        col = self.panel.column(key)
+        if col is None:
+            raise KeyError(key)
+        value = self.panel.values[self.row, col]
+        return None if math.isnan(value) else float(value)
+    
+    def __iter__(self):
+        yield 'name'
+        yield from self.panel.years.tolist()
+    
+    def __len__(self):
+        return len(self.panel.years) + 1
+    
+    def __repr__(self):
+        return f"CountryRow({self.panel.names[self.row]!r})"
+
+
+class GDPPanel:
+    """ВВП как матрица float64 (страны × годы) с NaN на месте пропусков
+    
+    Годы идут подряд от first_year, так что столбец года — это year - first_year.
+    row_of отображает название страны из CSV в номер строки.
+    """
+    
+    def __init__(self, names, years, values):
+        self.names = list(names)
+        self.years = np.asarray(years, dtype=np.int64)
+        self.values = np.asarray(values, dtype=np.float64)
+        self.first_year = int(self.years[0]) if len(self.years) else 0
+        self.row_of = {}
+        for i, name in enumerate(self.names):
+            self.row_of.setdefault(name, i)
+    
+    @classmethod
+    def from_csv(cls, csv_path, name_column=NAME_COLUMN):
+        """Прочитать широкий CSV (страна, затем столбцы-годы) в панель"""
+        with open(csv_path, 'r', encoding='utf-8', newline='') as file:
+            reader = csv.reader(file)
+            header = next(reader)
+            name_col = header.index(name_column)
+            year_cols = {int(m.group(1)): k for k, h in enumerate(header)
+                         for m in [_YEAR_COLUMN.match(h)] if m}
+            if not year_cols:
+                raise ValueError(f"В {csv_path} нет столбцов с годами")
+            years = np.arange(min(year_cols), max(year_cols) + 1)
+            
+            names, rows = [], []
+            for record in reader:
+                if len(record) <= name_col or not record[name_col].strip():
+                    continue
+                names.append(record[name_col].strip())
+                rows.append([parse_number(record[year_cols[y]]) if y in year_cols and year_cols[y] < len(record)
+                             else math.nan for y in years.tolist()])
+        
+        values = np.array(rows, dtype=np.float64).reshape(len(names), len(years))
+        return cls(names, years, values)
+    
+    def __len__(self):
+        return len(self.names)
+    
+    def column(self, year):
+        """Номер столбца года или None, если года нет в панели"""
+        if not isinstance(year, (int, np.integer)):
+            return None
+        col = int(year) - self.first_year
+        return col if 0 <= col < len(self.years) else None
+    
+    def window(self, start_year, end_year):
+        """Срез значений за годы start_year..end_year (обрезается по границам панели)"""
+        lo = max(start_year - self.first_year, 0)
+        hi = min(end_year - self.first_year + 1, len(self.years))
+        return self.values[:, lo:max(lo, hi)]
+    
+    def series(self, name):
+        """Ряд значений страны по точному названию"""
+        return self.values[self.row_of[name]]
+    
+    def rows(self):
+        """Все строки в формате countries_data"""
+        return [CountryRow(self, i) for i in range(len(self.names))]
@@ -5,69 +5,108 @@ Law of Minimal Ontological Load - Economic Systems Analysis
 Official tool for MOL Foundation
 """
 
-import csv
 import math
 import statistics
-import requests
 import json
 import os
+import sqlite3
+
+import numpy as np
+
+from mol_backtest import backtest, load_labelled_periods
+from mol_country_index import CountryIndex, resolve_iso3
+from mol_economic_batch import batch_O_E, bootstrap_O_E, scan_all_windows, top_windows
+from mol_gdp_panel import GDPPanel
+from mol_worldbank import WorldBankFetcher, FIRST_YEAR, LAST_YEAR
+
+WORLDBANK_ERRORS = (OSError, ValueError, sqlite3.Error)
 
 print("🌍 MOL 5.2: ИСПРАВЛЕННАЯ МОДЕЛЬ С НОРМАЛИЗАЦИЕЙ ДАННЫХ")
 print("=" * 65)
 
 class MOLEconomicAnalyzer:
-    def __init__(self):
-        self.countries_data = []
+    def __init__(self, worldbank=None):
+        self.countries_data = []  # строки self.panel в формате {'name': ..., год: значение}
+        self.panel = None
+        self.countries = None  # CountryIndex: названия, псевдонимы и ISO-коды → строки панели
+        self.worldbank = worldbank  # WorldBankFetcher, создаётся при первом обращении
+        self.worldbank_disabled = False  # кэш World Bank недоступен: считаем без FDI
+        self.worldbank_reported = set()  # коды, об отказе API для которых уже сообщили
         
     def load_gdp_data(self, csv_path):
-        """Загрузка данных ВВП из CSV файла"""
+        """Загрузка данных ВВП из CSV файла в панель GDPPanel"""
         try:
-            with open(csv_path, 'r', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    country_data = {'name': row['Country']}
-                    for year in range(1975, 2026):
-                        value = row.get(str(year), '').strip()
-                        country_data[year] = float(value) if value and value.replace('.', '').isdigit() else None
-                    self.countries_data.append(country_data)
+            self.panel = GDPPanel.from_csv(csv_path)
+            self.countries_data = self.panel.rows()
+            self.countries = CountryIndex(self.panel.names)
             print(f"✅ Загружено {len(self.countries_data)} стран")
+            unresolved = self.countries.unresolved()
+            if unresolved:
+                print(f"ℹ️ Без ISO-кода ({len(unresolved)}, FDI не запрашивается): {', '.join(unresolved)}")
             return True
         except Exception as e:
             print(f"❌ Ошибка загрузки данных: {e}")
             return False
 
+    def worldbank_code(self, country_name):
+        """ISO3-код страны для World Bank API или None"""
+        if self.countries is not None:
+            return self.countries.iso3_of(country_name)
+        return resolve_iso3(country_name)
+
     def get_worldbank_data_safe(self, country_name, indicator, year):
-        """Безопасное получение данных с нормализацией"""
-        country_codes = {
-            'united states': 'USA', 'china': 'CHN', 'japan': 'JPN', 
-            'germany': 'DEU', 'russia': 'RUS', 'france': 'FRA', 
-            'united kingdom': 'GBR', 'india': 'IND', 'brazil': 'BRA', 
-            'italy': 'ITA', 'canada': 'CAN', 'australia': 'AUS', 
-            'korea': 'KOR', 'spain': 'ESP', 'mexico': 'MEX', 
-            'greece': 'GRC', 'argentina': 'ARG'
-        }
-        
-        country_key = None
-        for key, code in country_codes.items():
-            if key in country_name.lower():
-                country_key = code
-                break
-                
+        """Безопасное получение данных с нормализацией (через кэш WorldBankFetcher)"""
+        country_key = self.worldbank_code(country_name)
         if not country_key:
             return None
-            
-        url = f"http://api.worldbank.org/v2/country/{country_key}/indicator/{indicator}?format=json&date={year}"
         
         try:
-            response = requests.get(url, timeout=10)
-            data = response.json()
-            if len(data) > 1 and data[1]:
-                value = data[1][0].get('value')
-                return float(value) if value else None
-        except:
-            pass
-            
-        return None
+            fetcher = self.worldbank_fetcher()
+            return fetcher.value(indicator, country_key, year) if fetcher is not None else None
+        except WORLDBANK_ERRORS as e:
+            self.worldbank_failed(e)
+            return None
+
+    def worldbank_fetcher(self):
+        """WorldBankFetcher или None, если World Bank отключён после ошибки кэша"""
+        if self.worldbank_disabled:
+            return None
+        if self.worldbank is None:
+            self.worldbank = WorldBankFetcher()
+        return self.worldbank
+
+    def worldbank_failed(self, error):
+        """После сетевой ошибки работаем только с кэшем, чтобы не ждать таймаут на каждом окне
+        
+        Если сам кэш не открылся (нет прав на запись, повреждённая SQLite),
+        World Bank отключается совсем и FDI не используется.
+        """
+        if self.worldbank is None or isinstance(error, sqlite3.Error):
+            print(f"⚠️ Кэш World Bank недоступен: {error}. Продолжаем без данных FDI.")
+            self.worldbank_disabled = True
+            return
+        print(f"⚠️ World Bank недоступен: {error}. Дальше используем только локальный кэш.")
+        self.worldbank.offline = True
+
+    def prefetch_worldbank(self, indicator, start_year=FIRST_YEAR, end_year=LAST_YEAR):
+        """Один пакетный запрос индикатора для всех распознанных стран"""
+        codes = [code for code in self.countries.iso3 if code]
+        if not codes:
+            return
+        try:
+            fetcher = self.worldbank_fetcher()
+            if fetcher is not None:
+                fetcher.fetch(indicator, codes, start_year, end_year)
+                self.worldbank_gaps(indicator)
+        except WORLDBANK_ERRORS as e:
+            self.worldbank_failed(e)
+
+    def worldbank_gaps(self, indicator):
+        """Один раз сообщить о кодах, по которым World Bank API отказал (FDI для них нет)"""
+        failed = sorted(set(self.worldbank.failed.get(indicator, {})) - self.worldbank_reported)
+        if failed:
+            print(f"⚠️ World Bank не вернул {indicator} для: {', '.join(failed)}")
+            self.worldbank_reported.update(failed)
 
     def calculate_safe_O_E(self, country, start_year, end_year):
         """Безопасный расчёт с нормализацией данных"""
@@ -150,12 +189,103 @@ class MOLEconomicAnalyzer:
         
         return O_E, details
 
+    def fdi_matrix(self, years):
+        """FDI по строкам панели и годам years (NaN, если страна не распознана или данных нет)"""
+        codes = self.countries.iso3
+        known = sorted({code for code in codes if code})
+        span = (min(FIRST_YEAR, min(years)), max(LAST_YEAR, max(years)))
+        values = {}
+        for attempt in range(2 if known else 0):  # второй проход — только из кэша после сетевой ошибки
+            try:
+                fetcher = self.worldbank_fetcher()
+                if fetcher is not None:
+                    values = fetcher.fetch('BX.KLT.DINV.CD', known, *span)
+                    self.worldbank_gaps('BX.KLT.DINV.CD')
+                break
+            except WORLDBANK_ERRORS as e:
+                self.worldbank_failed(e)
+        fdi = [[values.get(code, {}).get(year) if code else None for year in years] for code in codes]
+        return np.array([[np.nan if v is None else v for v in row] for row in fdi],
+                        dtype=np.float64).reshape(len(codes), len(years))
+
+    def fdi_vector(self, year):
+        """FDI за один год по строкам панели"""
+        return self.fdi_matrix([year])[:, 0]
+
+    def calculate_all_O_E(self, start_year, end_year, fdi=None):
+        """calculate_safe_O_E сразу для всех стран панели (см. mol_economic_batch.batch_O_E)"""
+        if fdi is None:
+            fdi = self.fdi_vector(end_year)
+        return batch_O_E(self.panel, start_year, end_year, fdi)
+
+    def bootstrap_all_O_E(self, start_year, end_year, resamples=2000, workers=1, seed=0, rows=None):
+        """Бутстрап-интервалы O(ℰ) и вероятности порогов 15/25 для всех стран (или строк rows)"""
+        return bootstrap_O_E(self.panel, start_year, end_year, self.fdi_vector(end_year),
+                             resamples, seed=seed, workers=workers, rows=rows)
+
+    def print_bootstrap(self, result, rows):
+        """Интервалы для выбранных строк панели"""
+        level = f"{result['confidence']:.0%}"
+        print(f"\n🎲 MOL 5.2: БУТСТРАП O(ℰ) ({result['resamples']} повторов, интервал {level})")
+        print("Страна           | O(ℰ)  | Интервал      | P(>15) | P(>25) | Точек")
+        print("-" * 70)
+        for i in rows:
+            if np.isnan(result['O_E'][i]):
+                continue
+            print(f"{self.panel.names[i][:15]:15} | {result['O_E'][i]:5.1f} | "
+                  f"{result['low'][i]:5.1f} - {result['high'][i]:5.1f} | {result['p_crisis'][i]:6.0%} | "
+                  f"{result['p_collapse'][i]:6.0%} | {result['data_points'][i]}")
+
+    def scan_windows(self, min_length=5, fdi=None):
+        """O(ℰ) всех стран для всех окон длиной от min_length лет (см. scan_all_windows)"""
+        if fdi is None:
+            fdi = self.fdi_matrix(self.panel.years.tolist())
+        return scan_all_windows(self.panel, fdi, min_length)
+
+    def print_window_scan(self, scan, top=10):
+        """Окна с наибольшим O(ℰ) по всем странам"""
+        print(f"\n🔭 MOL 5.2: ВСЕ ОКНА (≥{scan['min_length']} лет), ТОП-{top} ПО O(ℰ)")
+        print("Страна           | Период    | O(ℰ)")
+        print("-" * 40)
+        for row, start_year, end_year, O_E in top_windows(scan, top):
+            print(f"{self.panel.names[row][:15]:15} | {start_year}-{end_year} | {O_E:5.1f}")
+        valid = ~np.isnan(scan['O_E'])
+        print(f"Окон с оценкой: {int(valid.sum())}, из них O(ℰ) > 15: {int((scan['O_E'][valid] > 15).sum())}")
+
+    def find_country(self, name):
+        """Строка countries_data по названию, псевдониму или ISO-коду (O(1)), либо None"""
+        row = self.countries.row(name)
+        return self.countries_data[row] if row is not None else None
+
+    def run_backtest(self, labels_path):
+        """Бэктест O(ℰ) по размеченной таблице кризисных и спокойных периодов"""
+        periods = load_labelled_periods(labels_path)
+        rows = [self.countries.row(p['country']) for p in periods]
+        years = list(range(min(p['end_year'] for p in periods), max(p['end_year'] for p in periods) + 1))
+        fdi = self.fdi_matrix(years)
+        result = backtest(self.panel, periods, rows, lambda year: fdi[:, year - years[0]])
+        
+        curves = result['curves']
+        print(f"\n🧪 MOL 5.2: БЭКТЕСТ ({curves['positives']} кризисов, {curves['negatives']} спокойных периодов)")
+        print(f"ROC AUC: {curves['roc_auc']:.3f}   Average precision: {curves['average_precision']:.3f}")
+        for threshold, c in result['current'].items():
+            print(f"Порог {threshold}: TP={c['tp']} FP={c['fp']} FN={c['fn']} TN={c['tn']}")
+        for name, best in result['best'].items():
+            print(f"Лучший порог ({name}): O(ℰ) > {best['threshold']:.1f} → "
+                  f"TPR {best['tpr']:.0%}, FPR {best['fpr']:.0%}, точность {best['precision']:.0%}")
+        if result['unscored']:
+            print(f"⚠️ Без оценки: {len(result['unscored'])} периодов "
+                  f"({', '.join(p['country'] for p in result['unscored'][:5])}...)")
+        return result
+
     def run_historical_tests(self):
         """Тестирование модели на исторических данных"""
         print("\n📊 MOL 5.2: ТЕСТ С НОРМАЛИЗОВАННЫМИ ДАННЫМИ")
         print("Страна           | Период    | O(ℰ)  | Прогноз      | Статус")
         print("-" * 70)
         
+        self.prefetch_worldbank('BX.KLT.DINV.CD')
+        
         test_cases = [
             ('United States', (2005, 2009), 'Кризис 2008'),
             ('Japan', (1985, 1993), 'Пузырь 1990'),
@@ -169,12 +299,7 @@ class MOLEconomicAnalyzer:
         total = 0
         
         for country_name, period, crisis_name in test_cases:
-            country = None
-            for c in self.countries_data:
-                if country_name.lower() in c['name'].lower():
-                    country = c
-                    break
-                    
+            country = self.find_country(country_name)
             if country:
                 O_E, details = self.calculate_safe_O_E(country, period[0], period[1])
                 if O_E is not None:
@@ -206,12 +331,7 @@ class MOLEconomicAnalyzer:
     def analyze_russia_2020_2024(self):
         """Анализ России 2020-2024"""
         print(f"\n🇷🇺 MOL 5.2: РОССИЯ 2020-2024")
-        russia = None
-        for c in self.countries_data:
-            if 'russia' in c['name'].lower():
-                russia = c
-                break
-                
+        russia = self.find_country('RUS')
         if russia:
             O_E_2020_2024, details = self.calculate_safe_O_E(russia, 2020, 2024)
             if O_E_2020_2024 is not None:
@@ -246,6 +366,11 @@ def main():
     # Анализ России
     analyzer.analyze_russia_2020_2024()
     
+    # Бэктест по размеченным периодам
+    labels_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mol_crisis_labels.csv')
+    if os.path.exists(labels_path):
+        analyzer.run_backtest(labels_path)
+    
     print(f"\n🔧 ИСПРАВЛЕНИЯ В MOL 5.2:")
     print("• Защита от отрицательных и аномальных значений")
     print("• Нормализация FDI в диапазоне [0, 1]")
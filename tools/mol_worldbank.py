@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+MOL 5.2: ПАКЕТНАЯ ЗАГРУЗКА ИНДИКАТОРОВ ВСЕМИРНОГО БАНКА
+Bulk World Bank indicator fetch with a persistent SQLite cache
+and a pooled concurrent HTTP client
+"""
+
+import os
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+WORLDBANK_URL = "https://api.worldbank.org/v2"
+CACHE_PATH = os.path.join('.mol_cache', 'worldbank.sqlite')
+DEFAULT_TTL = 30 * 24 * 3600  # секунд; годовые ряды ВБ обновляются редко
+FIRST_YEAR, LAST_YEAR = 1975, 2025
+PER_PAGE = 20000
+CODES_PER_REQUEST = 60  # держим длину URL в разумных пределах
+REQUEST_TIMEOUT = 10
+MAX_WORKERS = 8
+RATE_PER_SECOND = 20.0  # вежливый предел для публичного API
+RETRIES = 4
+BACKOFF = 0.5  # секунд, удваивается с каждой попыткой
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class RateLimiter:
+    """Не более rate запросов в секунду на все потоки (равномерные интервалы)"""
+    
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_slot = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class PooledHTTPClient:
+    """Пул потоков над одной keep-alive сессией requests
+    
+    Одновременно выполняется не больше max_workers запросов, общий темп
+    ограничен RateLimiter. Сетевые ошибки и ответы RETRY_STATUSES повторяются
+    с экспоненциальной задержкой (учитывая Retry-After). Одинаковые запросы,
+    пока первый ещё выполняется, получают тот же Future.
+    """
+    
+    def __init__(self, max_workers=MAX_WORKERS, rate=RATE_PER_SECOND, retries=RETRIES,
+                 backoff=BACKOFF, timeout=REQUEST_TIMEOUT, session=None):
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='mol-http')
+        self.limiter = RateLimiter(rate)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.in_flight = {}
+        self.lock = threading.Lock()
+        self.calls = 0  # HTTP-запросы, включая повторы
+        self.coalesced = 0
+    
+    def _request(self, url, params):
+        for attempt in range(self.retries + 1):
+            self.limiter.wait()
+            with self.lock:
+                self.calls += 1
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries:
+                    raise
+                delay = self.backoff * 2 ** attempt
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    response.raise_for_status()
+                    return response.json()
+                retry_after = response.headers.get('Retry-After', '')
+                delay = float(retry_after) if retry_after.isdigit() else self.backoff * 2 ** attempt
+            time.sleep(delay * (1 + random.random() * 0.1))
+    
+    def submit(self, url, params=None):
+        """Future с JSON-ответом; дубликат уже выполняющегося запроса не уходит в сеть"""
+        key = (url, tuple(sorted((params or {}).items())))
+        with self.lock:
+            future = self.in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future
+            future = self.executor.submit(self._request, url, dict(params or {}))
+            self.in_flight[key] = future
+        future.add_done_callback(lambda _: self._forget(key))
+        return future
+    
+    def _forget(self, key):
+        with self.lock:
+            self.in_flight.pop(key, None)
+    
+    def get_json(self, url, params=None):
+        return self.submit(url, params).result()
+    
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.session.close()
+
+
+class IndicatorCache:
+    """SQLite-кэш значений (индикатор, страна, год) и покрытых диапазонов"""
+    
+    def __init__(self, path=CACHE_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS observations (
+                indicator TEXT, country TEXT, year INTEGER, value REAL,
+                PRIMARY KEY (indicator, country, year));
+            CREATE TABLE IF NOT EXISTS coverage (
+                indicator TEXT, country TEXT, first_year INTEGER, last_year INTEGER,
+                fetched_at REAL, PRIMARY KEY (indicator, country));
+        """)
+    
+    def covered(self, indicator, countries, start_year, end_year, ttl=None):
+        """Страны, для которых диапазон лет уже загружен (и не старше ttl секунд)"""
+        oldest = time.time() - ttl if ttl is not None else float('-inf')
+        rows = self.db.execute(
+            "SELECT country, first_year, last_year, fetched_at FROM coverage WHERE indicator = ?",
+            (indicator,))
+        wanted = set(countries)
+        return {country for country, first, last, fetched_at in rows
+                if country in wanted and first <= start_year and last >= end_year and fetched_at >= oldest}
+    
+    def values(self, indicator, countries, start_year, end_year):
+        """{страна: {год: значение}} из кэша; отсутствующие значения хранятся как None"""
+        result = {country: {} for country in countries}
+        placeholders = ','.join('?' * len(result))
+        rows = self.db.execute(
+            f"SELECT country, year, value FROM observations WHERE indicator = ? "
+            f"AND year BETWEEN ? AND ? AND country IN ({placeholders})",
+            (indicator, start_year, end_year, *result))
+        for country, year, value in rows:
+            result[country][year] = value
+        return result
+    
+    def store(self, indicator, countries, start_year, end_year, observations, fetched_at=None):
+        """Записать ответ для диапазона; пропуски внутри диапазона тоже считаются загруженными"""
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO observations VALUES (?, ?, ?, ?)",
+                [(indicator, country, year, value) for (country, year), value in observations.items()])
+            self.db.executemany(
+                "INSERT OR REPLACE INTO coverage VALUES (?, ?, ?, ?, ?)",
+                [(indicator, country, start_year, end_year, fetched_at) for country in countries])
+    
+    def close(self):
+        self.db.close()
+
+
+class WorldBankFetcher:
+    """Пакетная загрузка индикатора сразу для многих стран и всего диапазона лет
+    
+    Один запрос (с постраничным чтением) покрывает до CODES_PER_REQUEST стран
+    за все годы. Ответы сохраняются в IndicatorCache, поэтому повторный анализ
+    не делает сетевых запросов. В offline-режиме сеть не используется вовсе,
+    а устаревшие по ttl данные всё равно возвращаются.
+    
+    Группу, которую API отклонил, делим пополам и запрашиваем снова, пока не
+    останутся отдельные коды; их ошибки копятся в failed ({индикатор: {страна:
+    ошибка}}) и до конца сессии не запрашиваются повторно.
+    """
+    
+    def __init__(self, cache=None, base_url=WORLDBANK_URL, ttl=DEFAULT_TTL, offline=False,
+                 client=None):
+        self.cache = cache if cache is not None else IndicatorCache()
+        self.base_url = base_url.rstrip('/')
+        self.ttl = ttl
+        self.offline = offline
+        self.client = client
+        self.failed = {}
+    
+    @property
+    def network_calls(self):
+        return self.client.calls if self.client is not None else 0
+    
+    def _client(self):
+        if self.client is None:
+            self.client = PooledHTTPClient()
+        return self.client
+    
+    @staticmethod
+    def _parse_page(data, observations):
+        """Добавить значения одной страницы в observations, вернуть число страниц"""
+        if not isinstance(data, list) or len(data) < 2:
+            # API сообщает об ошибке одним объектом [{"message": ...}]
+            raise ValueError(f"Неожиданный ответ World Bank API: {str(data)[:200]}")
+        for item in data[1] or []:
+            year = item.get('date', '')
+            if not year.isdigit():
+                continue
+            value = item.get('value')
+            observations[(item['countryiso3code'] or item['country']['id'], int(year))] = (
+                float(value) if value is not None else None)
+        return int(data[0].get('pages', 1) or 1)
+    
+    def _download(self, jobs):
+        """Параллельно скачать все страницы для списка (индикатор, страны, начало, конец)
+        
+        Сначала запрашиваются первые страницы всех заданий, затем сразу все
+        оставшиеся. Ошибка одного задания не мешает остальным. Возвращает
+        ({(индикатор, страны): {(страна, год): значение}}, {(индикатор, страны): ошибка}).
+        """
+        client = self._client()
+        requests_by_job = {}
+        for indicator, countries, start_year, end_year in jobs:
+            url = f"{self.base_url}/country/{';'.join(countries)}/indicator/{indicator}"
+            params = {'format': 'json', 'date': f"{start_year}:{end_year}", 'per_page': PER_PAGE}
+            requests_by_job[(indicator, countries)] = (url, params, client.submit(url, dict(params, page=1)))
+        
+        results, errors, rest = {}, {}, []
+        for job, (url, params, first) in requests_by_job.items():
+            observations = {}
+            try:
+                pages = self._parse_page(first.result(), observations)
+            except (OSError, ValueError) as e:
+                errors[job] = e
+                continue
+            results[job] = observations
+            rest.extend((job, client.submit(url, dict(params, page=page))) for page in range(2, pages + 1))
+        for job, future in rest:
+            try:
+                if job in results:
+                    self._parse_page(future.result(), results[job])
+            except (OSError, ValueError) as e:
+                errors[job] = e
+                del results[job]
+        return results, errors
+    
+    def fetch_many(self, indicators, countries, start_year=FIRST_YEAR, end_year=LAST_YEAR):
+        """{индикатор: {страна: {год: значение}}}; все недостающие группы качаются одновременно"""
+        countries = list(dict.fromkeys(countries))
+        if not self.offline:
+            jobs = []
+            for indicator in indicators:
+                fresh = self.cache.covered(indicator, countries, start_year, end_year, self.ttl)
+                failed = self.failed.get(indicator, {})
+                missing = [c for c in countries if c not in fresh and c not in failed]
+                jobs.extend((indicator, tuple(missing[i:i + CODES_PER_REQUEST]), start_year, end_year)
+                            for i in range(0, len(missing), CODES_PER_REQUEST))
+            stored = False
+            while jobs:
+                results, errors = self._download(jobs)
+                for (indicator, group), observations in results.items():
+                    self.cache.store(indicator, group, start_year, end_year, observations)
+                stored = stored or bool(results)
+                offline = [e for e in errors.values() if isinstance(e, (requests.ConnectionError, requests.Timeout))]
+                if offline and not stored:
+                    raise offline[0]  # сети нет совсем: пусть вызывающий перейдёт на кэш
+                jobs = []
+                for (indicator, group), error in errors.items():
+                    if len(group) > 1 and error not in offline:
+                        half = (len(group) + 1) // 2
+                        jobs.extend([(indicator, group[:half], start_year, end_year),
+                                     (indicator, group[half:], start_year, end_year)])
+                    else:
+                        self.failed.setdefault(indicator, {}).update(dict.fromkeys(group, str(error)))
+        return {indicator: self.cache.values(indicator, countries, start_year, end_year)
+                for indicator in indicators}
+    
+    def fetch(self, indicator, countries, start_year=FIRST_YEAR, end_year=LAST_YEAR):
+        """{страна: {год: значение}} для ISO3-кодов countries; сеть только для непокрытых стран"""
+        return self.fetch_many([indicator], countries, start_year, end_year)[indicator]
+    
+    def value(self, indicator, country, year):
+        """Одно значение; при промахе загружается весь ряд страны за FIRST_YEAR..LAST_YEAR"""
+        start_year, end_year = min(FIRST_YEAR, year), max(LAST_YEAR, year)
+        return self.fetch(indicator, [country], start_year, end_year)[country].get(year)
@@ -7,154 +7,1058 @@ Works immediately with stations.csv dataset
 """
 
 import csv
+import hashlib
+import json
 import math
 import os
+import re
+import shutil
+import tempfile
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+KM_PER_DEGREE = 111.32
+TILED_BUILD_THRESHOLD = 200000  # stops; larger networks are built tile by tile on disk
+DEFAULT_TILE_KM = 10.0
+LOAD_PROGRESS_EVERY = 100000
+STATION_CACHE_DIR = '.mol_cache'
+STATIONS_PATHS = ('data/stations.csv', '../data/stations.csv', 'stations.csv', './stations.csv')
+STATION_CACHE_VERSION = 2
+YEAR_COLUMNS = ('jahr', 'year')  # optional per-row snapshot year in stations.csv
+
+# O(ℰ) classification: connections vs min(num_lines * 2, 20)
+UNDERLOAD_RATIO = 0.5
+OVERLOAD_RATIO = 2.0
+MAX_OPTIMAL_CONNECTIONS = 20
+O_E_UNDERLOADED = 0.3
+O_E_OPTIMAL = 0.5
+O_E_OVERLOADED = 0.8
+O_E_ISOLATED = 0.5
+MOL_OPTIMAL_MAX = 0.35  # reporting buckets
+MOL_PROBLEMATIC_MIN = 0.7
+SWEEP_RADII = (0.3, 0.5, 1.0, 2.0)
+RESULT_CHUNK = 65536
+
+_LINE_TOKEN = re.compile(r"'([^']*)'|\"([^\"]*)\"|([^\s,\[\](){}'\"]+)")
+
+
+def parse_line_list(text):
+    """Parse an in_linien literal such as "['M1', 'S3']" without eval"""
+    return [m.group(m.lastindex) for m in _LINE_TOKEN.finditer(text)]
+
+
+def parse_year(text):
+    """Leading four-digit year of a value such as "1961" or "1961-05-01", 0 if absent"""
+    match = re.match(r'\s*(\d{4})', text)
+    return int(match.group(1)) if match else 0
+
+
+def parse_standort(text):
+    """Parse a standort value "lat, lon" into two floats"""
+    lat, lon = text.strip().strip('"').split(',')
+    return float(lat), float(lon)
+
+
+def fast_distance_km(lat1, lon1, lat2, lon2):
+    """Vectorized form of calculate_distance_fast (equirectangular, km)"""
+    dx = (lon2 - lon1) * KM_PER_DEGREE * np.cos(np.radians((lat1 + lat2) / 2))
+    dy = (lat2 - lat1) * KM_PER_DEGREE
+    return np.sqrt(dx * dx + dy * dy)
+
+
+class SpatialGridIndex:
+    """Uniform lat/lon cell grid answering exact radius queries"""
+    
+    def __init__(self, lats, lons, cell_km=1.0):
+        self.lats = np.ascontiguousarray(lats, dtype=np.float64)
+        self.lons = np.ascontiguousarray(lons, dtype=np.float64)
+        self.cell_km = float(cell_km)
+        n = len(self.lats)
+        
+        if n:
+            self.lat0 = float(self.lats.min())
+            self.lon0 = float(self.lons.min())
+            self.max_abs_lat = float(np.abs(self.lats).max())
+        else:
+            self.lat0 = self.lon0 = self.max_abs_lat = 0.0
+        
+        # Cell width in longitude is taken at the highest latitude present,
+        # so a cell is never narrower than cell_km anywhere in the data
+        self.cell_lat = self.cell_km / KM_PER_DEGREE
+        self.cell_lon = self.cell_km / (KM_PER_DEGREE * self._cos(self.max_abs_lat))
+        
+        cx, cy = self._cells(self.lats, self.lons)
+        self.ncols = int(cx.max()) + 1 if n else 1
+        self.nrows = int(cy.max()) + 1 if n else 1
+        keys = cy * self.ncols + cx
+        self.order = np.argsort(keys, kind='stable')
+        cell_keys, starts = np.unique(keys[self.order], return_index=True)
+        ends = np.append(starts[1:], n)
+        self.cells = {int(k): (int(s), int(e)) for k, s, e in zip(cell_keys, starts, ends)}
+    
+    @staticmethod
+    def _cos(lat):
+        return max(math.cos(math.radians(min(abs(lat), 89.9))), 1e-6)
+    
+    def _cells(self, lats, lons):
+        cx = np.floor((lons - self.lon0) / self.cell_lon).astype(np.int64)
+        cy = np.floor((lats - self.lat0) / self.cell_lat).astype(np.int64)
+        return cx, cy
+    
+    def _reach(self, radius, lat=None):
+        """Number of cells to scan in x and y so that no stop within radius is missed"""
+        ref_lat = self.max_abs_lat if lat is None else max(abs(lat), self.max_abs_lat)
+        ry = int(math.ceil(radius / self.cell_km))
+        rx = int(math.ceil(radius / (KM_PER_DEGREE * self._cos(ref_lat)) / self.cell_lon))
+        return max(rx, 1), max(ry, 1)
+    
+    def _block(self, cx, cy, rx, ry):
+        """Indices of all stops in the (2rx+1) x (2ry+1) cells around (cx, cy)"""
+        parts = []
+        for y in range(cy - ry, cy + ry + 1):
+            for x in range(cx - rx, cx + rx + 1):
+                if 0 <= x < self.ncols:
+                    span = self.cells.get(y * self.ncols + x)
+                    if span:
+                        parts.append(self.order[span[0]:span[1]])
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(parts)
+    
+    def query_radius(self, lat, lon, radius):
+        """All stops strictly closer than radius km: (indices, distances)"""
+        rx, ry = self._reach(radius, lat)
+        cx, cy = self._cells(np.float64(lat), np.float64(lon))
+        cand = self._block(int(cx), int(cy), rx, ry)
+        dist = fast_distance_km(lat, lon, self.lats[cand], self.lons[cand])
+        mask = dist < radius
+        return cand[mask], dist[mask]
+    
+    def query_bbox(self, south, west, north, east):
+        """Indices of all stops with south <= lat <= north and west <= lon <= east"""
+        cx0, cy0 = self._cells(np.float64(south), np.float64(west))
+        cx1, cy1 = self._cells(np.float64(north), np.float64(east))
+        cx0, cx1 = max(int(cx0), 0), min(int(cx1), self.ncols - 1)
+        cy0, cy1 = max(int(cy0), 0), min(int(cy1), self.nrows - 1)
+        parts = []
+        for y in range(cy0, cy1 + 1):
+            for x in range(cx0, cx1 + 1):
+                span = self.cells.get(y * self.ncols + x)
+                if span:
+                    parts.append(self.order[span[0]:span[1]])
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        cand = np.concatenate(parts)
+        lats, lons = self.lats[cand], self.lons[cand]
+        return cand[(lats >= south) & (lats <= north) & (lons >= west) & (lons <= east)]
+    
+    def neighbor_pairs(self, radius, sources=None):
+        """All ordered pairs (i, j), i != j, closer than radius, sorted by (i, j)
+        
+        sources is an optional boolean mask restricting which stops appear as i.
+        """
+        rx, ry = self._reach(radius)
+        src_parts, dst_parts, dist_parts = [], [], []
+        
+        for key, (start, end) in self.cells.items():
+            cy, cx = divmod(key, self.ncols)
+            members = self.order[start:end]
+            if sources is not None:
+                members = members[sources[members]]
+                if not len(members):
+                    continue
+            cand = self._block(cx, cy, rx, ry)
+            dist = fast_distance_km(self.lats[members][:, None], self.lons[members][:, None],
+                                    self.lats[cand][None, :], self.lons[cand][None, :])
+            mask = (dist < radius) & (members[:, None] != cand[None, :])
+            rows, cols = np.nonzero(mask)
+            src_parts.append(members[rows])
+            dst_parts.append(cand[cols])
+            dist_parts.append(dist[rows, cols])
+        
+        if not src_parts:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, np.empty(0, dtype=np.float64)
+        
+        src = np.concatenate(src_parts)
+        dst = np.concatenate(dst_parts)
+        dist = np.concatenate(dist_parts)
+        order = np.argsort(src * len(self.lats) + dst)
+        return src[order], dst[order], dist[order]
+
+
+def calculate_O_E_batch(degree, num_lines):
+    """O(ℰ) for every stop in one NumPy pass, same rules as calculate_O_E"""
+    degree = np.asarray(degree)
+    optimal = np.maximum(np.minimum(np.asarray(num_lines) * 2, MAX_OPTIMAL_CONNECTIONS), 1)
+    
+    O_E = np.full(degree.shape, O_E_OPTIMAL)
+    O_E[degree < UNDERLOAD_RATIO * optimal] = O_E_UNDERLOADED
+    O_E[degree > OVERLOAD_RATIO * optimal] = O_E_OVERLOADED
+    O_E[degree == 0] = O_E_ISOLATED
+    return O_E
+
+
+def _smallest_k(values, k):
+    """Positions of the k smallest values, ties going to the earliest positions"""
+    if len(values) <= k:
+        return np.arange(len(values))
+    kth = np.partition(values, k - 1)[k - 1]
+    below = np.flatnonzero(values < kth)
+    return np.concatenate([below, np.flatnonzero(values == kth)[:k - len(below)]])
+
+
+def _largest_k(values, k):
+    """Positions of the k largest values, ties going to the latest positions"""
+    if len(values) <= k:
+        return np.arange(len(values))
+    kth = np.partition(values, len(values) - k)[len(values) - k]
+    above = np.flatnonzero(values > kth)
+    ties = np.flatnonzero(values == kth)
+    return np.concatenate([above, ties[len(ties) - (k - len(above)):]])
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class StationStore:
+    """Columnar station table with interned types and a CSR station→lines map
+    
+    lats/lons are float64 arrays; line_indices[line_offsets[i]:line_offsets[i + 1]]
+    are the rows of line_names serving station i. years holds each row's
+    snapshot year, 0 when the source has none.
+    """
+    
+    COLUMNS = ('ids', 'names', 'type_codes', 'type_names', 'lats', 'lons',
+               'line_offsets', 'line_indices', 'line_names', 'years')
+    
+    def __init__(self, ids, names, type_codes, type_names, lats, lons,
+                 line_offsets, line_indices, line_names, years=None):
+        self.ids = ids
+        self.names = names
+        self.type_codes = type_codes
+        self.type_names = type_names
+        self.lats = lats
+        self.lons = lons
+        self.line_offsets = line_offsets
+        self.line_indices = line_indices
+        self.line_names = line_names
+        self.years = years if years is not None else np.zeros(len(lats), dtype=np.int32)
+    
+    @classmethod
+    def build(cls, rows):
+        """Build a store from (id, name, type, lat, lon, lines, year) tuples"""
+        ids, names, type_codes, lats, lons, years = [], [], [], [], [], []
+        line_offsets, line_indices = [0], []
+        type_lookup, line_lookup = {}, {}
+        
+        for i, (station_id, name, station_type, lat, lon, lines, year) in enumerate(rows, 1):
+            years.append(year)
+            ids.append(station_id)
+            names.append(name)
+            type_codes.append(type_lookup.setdefault(station_type, len(type_lookup)))
+            lats.append(lat)
+            lons.append(lon)
+            for line in lines:
+                line_indices.append(line_lookup.setdefault(line, len(line_lookup)))
+            line_offsets.append(len(line_indices))
+            
+            if i % LOAD_PROGRESS_EVERY == 0:
+                print(f"📥 Loaded {i} stops...")
+        
+        return cls(
+            ids=np.array(ids, dtype=str),
+            names=np.array(names, dtype=str),
+            type_codes=np.array(type_codes, dtype=np.int32),
+            type_names=np.array(list(type_lookup), dtype=str),
+            lats=np.array(lats, dtype=np.float64),
+            lons=np.array(lons, dtype=np.float64),
+            line_offsets=np.array(line_offsets, dtype=np.int64),
+            line_indices=np.array(line_indices, dtype=np.int32),
+            line_names=np.array(list(line_lookup), dtype=str),
+            years=np.array(years, dtype=np.int32),
+        )
+    
+    def take(self, rows):
+        """New store holding only the given rows; types and line IDs keep their codes"""
+        rows = np.asarray(rows, dtype=np.int64)
+        counts = self.num_lines[rows]
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        starts = np.repeat(self.line_offsets[rows] - offsets[:-1], counts)
+        return StationStore(
+            ids=self.ids[rows],
+            names=self.names[rows],
+            type_codes=self.type_codes[rows],
+            type_names=self.type_names,
+            lats=self.lats[rows],
+            lons=self.lons[rows],
+            line_offsets=offsets,
+            line_indices=self.line_indices[starts + np.arange(offsets[-1])],
+            line_names=self.line_names,
+            years=self.years[rows],
+        )
+    
+    def save(self, directory):
+        """Write every column as a separate .npy file"""
+        os.makedirs(directory, exist_ok=True)
+        for column in self.COLUMNS:
+            np.save(os.path.join(directory, f'{column}.npy'), getattr(self, column))
+    
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        """Open columns written by save, memory-mapped by default"""
+        return cls(**{column: np.load(os.path.join(directory, f'{column}.npy'), mmap_mode=mmap_mode)
+                      for column in cls.COLUMNS})
+    
+    def __len__(self):
+        return len(self.lats)
+    
+    @property
+    def num_lines(self):
+        return np.diff(self.line_offsets)
+    
+    def lines_of(self, i):
+        start, end = self.line_offsets[i], self.line_offsets[i + 1]
+        return [str(self.line_names[k]) for k in self.line_indices[start:end]]
+    
+    def station(self, i):
+        """Row i as the per-station dict used by calculate_O_E and the reports"""
+        lines = self.lines_of(i)
+        return {
+            'index': i,
+            'id': str(self.ids[i]),
+            'name': str(self.names[i]),
+            'type': str(self.type_names[self.type_codes[i]]),
+            'lat': float(self.lats[i]),
+            'lon': float(self.lons[i]),
+            'lines': lines,
+            'num_lines': len(lines),
+            'year': int(self.years[i])
+        }
+
+
+class TransportResultSink:
+    """One-pass consumer of per-stop results
+    
+    Keeps running counters, bounded top-k/bottom-k selections of O(ℰ) (and
+    of load, when given) and optionally streams every row to a .csv or
+    .jsonl file, so no per-stop list is ever held or sorted. Rankings order
+    ties by stop index, matching a stable sort of all stops by O(ℰ).
+    """
+    
+    FIELDS = ('stop_id', 'stop_name', 'type', 'num_lines', 'lat', 'lon', 'O_E', 'connections')
+    
+    def __init__(self, k=10, path=None):
+        self.k = k
+        self.path = path
+        self.count = 0
+        self.optimal = 0
+        self.problematic = 0
+        self.O_E_sum = 0.0
+        self._lowest, self._highest, self._loaded = [], [], []
+        self._file = self._writer = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    @property
+    def mean_O_E(self):
+        return self.O_E_sum / self.count if self.count else 0.0
+    
+    @property
+    def network_optimality(self):
+        return self.optimal / self.count * 100 if self.count else 0.0
+    
+    def _rows(self, stations, start, picks, O_E, degree, num_lines, load):
+        rows = []
+        for p in picks.tolist():
+            i = start + p
+            row = {
+                'stop_id': str(stations.ids[i]),
+                'stop_name': str(stations.names[i]),
+                'type': str(stations.type_names[stations.type_codes[i]]),
+                'num_lines': int(num_lines[p]),
+                'lat': float(stations.lats[i]),
+                'lon': float(stations.lons[i]),
+                'O_E': float(O_E[p]),
+                'connections': int(degree[p])
+            }
+            if load is not None:
+                row['load'] = float(load[p])
+            rows.append((i, row))
+        return rows
+    
+    def add_chunk(self, stations, start, O_E, degree, num_lines, load=None):
+        """Consume rows start .. start + len(O_E) of the network"""
+        O_E = np.asarray(O_E)
+        self.count += len(O_E)
+        self.optimal += int(np.count_nonzero(O_E <= MOL_OPTIMAL_MAX))
+        self.problematic += int(np.count_nonzero(O_E >= MOL_PROBLEMATIC_MIN))
+        self.O_E_sum += float(O_E.sum())
+        
+        picks = lambda positions: self._rows(stations, start, positions, O_E, degree, num_lines, load)
+        self._lowest = sorted(self._lowest + [(row['O_E'], i, row) for i, row in picks(_smallest_k(O_E, self.k))],
+                              key=lambda t: t[:2])[:self.k]
+        self._highest = sorted(self._highest + [(row['O_E'], i, row) for i, row in picks(_largest_k(O_E, self.k))],
+                               key=lambda t: t[:2])[-self.k:]
+        if load is not None:
+            self._loaded = sorted(self._loaded + [(-row['load'], i, row)
+                                                  for i, row in picks(_smallest_k(-np.asarray(load), self.k))],
+                                  key=lambda t: t[:2])[:self.k]
+        
+        if self.path:
+            self._write(stations, start, O_E, degree, num_lines, load)
+    
+    def _write(self, stations, start, O_E, degree, num_lines, load):
+        end = start + len(O_E)
+        fields = self.FIELDS + (('load',) if load is not None else ())
+        columns = [
+            stations.ids[start:end].tolist(),
+            stations.names[start:end].tolist(),
+            stations.type_names[stations.type_codes[start:end]].tolist(),
+            np.asarray(num_lines).tolist(),
+            stations.lats[start:end].tolist(),
+            stations.lons[start:end].tolist(),
+            O_E.tolist(),
+            np.asarray(degree).tolist(),
+        ]
+        if load is not None:
+            columns.append(np.asarray(load).tolist())
+        
+        if self._file is None:
+            self._file = open(self.path, 'w', encoding='utf-8', newline='')
+            if not self.path.endswith('.jsonl'):
+                self._writer = csv.writer(self._file)
+                self._writer.writerow(fields)
+        
+        if self._writer is not None:
+            self._writer.writerows(zip(*columns))
+        else:
+            self._file.writelines(json.dumps(dict(zip(fields, row)), ensure_ascii=False) + '\n'
+                                  for row in zip(*columns))
+    
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = self._writer = None
+    
+    def lowest_rows(self):
+        """Lowest-O(ℰ) stops, ascending"""
+        return [row for _, _, row in self._lowest]
+    
+    def highest_rows(self):
+        """Highest-O(ℰ) stops, ascending (like the tail of a full sort)"""
+        return [row for _, _, row in self._highest]
+    
+    def most_loaded_rows(self):
+        """Highest-load stops, descending"""
+        return [row for _, _, row in self._loaded]
+
+
+class TransportGraph:
+    """Compact CSR graph over station indices
+    
+    neighbors[offsets[i]:offsets[i + 1]] (int32) are the stops adjacent to
+    stop i and weights (float32) holds 1 / (1 + distance) for each edge.
+    A graph loaded from a temporary directory owns it: close() (or leaving a
+    with block, or garbage collection) deletes the directory.
+    """
+    
+    COLUMNS = ('offsets', 'neighbors', 'weights')
+    
+    def __init__(self, offsets, neighbors, weights):
+        self.offsets = offsets
+        self.neighbors = neighbors
+        self.weights = weights
+        self._cleanup = None
+    
+    @classmethod
+    def from_pairs(cls, n, src, dst, weights):
+        """Build from edge arrays already sorted by source"""
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=offsets[1:])
+        return cls(offsets, np.asarray(dst, dtype=np.int32), np.asarray(weights, dtype=np.float32))
+    
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for column in self.COLUMNS:
+            np.save(os.path.join(directory, f'{column}.npy'), getattr(self, column))
+    
+    @classmethod
+    def load(cls, directory, mmap_mode='r', owned=False):
+        """Memory-map a saved graph; owned=True deletes directory when the graph is closed"""
+        graph = cls(**{column: np.load(os.path.join(directory, f'{column}.npy'), mmap_mode=mmap_mode)
+                       for column in cls.COLUMNS})
+        if owned:
+            graph._cleanup = weakref.finalize(graph, shutil.rmtree, directory, ignore_errors=True)
+        return graph
+    
+    def close(self):
+        """Delete the owned on-disk directory, if any (the mapped arrays stay readable)"""
+        if self._cleanup is not None:
+            self._cleanup()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def __len__(self):
+        return len(self.offsets) - 1
+    
+    @property
+    def num_edges(self):
+        return int(self.offsets[-1])
+    
+    def degree(self):
+        """Number of neighbours of every stop"""
+        return np.diff(self.offsets)
+    
+    def degree_of(self, i):
+        return int(self.offsets[i + 1] - self.offsets[i])
+    
+    def neighbors_of(self, i):
+        """(neighbour indices, weights) of stop i as array views"""
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return self.neighbors[start:end], self.weights[start:end]
+    
+    def __iter__(self):
+        """Yield (i, neighbour indices, weights) for every stop"""
+        for i in range(len(self)):
+            yield (i, *self.neighbors_of(i))
+
+
+def tile_block(lats, lons, tiles, key, max_distance):
+    """Adjacency rows of the stops in one tile, computed against the tile plus its halo
+    
+    Returns (core, counts, neighbors, weights): the global indices of the tile's
+    stops, their degrees, and their concatenated neighbour rows in core order.
+    """
+    ty, tx = divmod(key, tiles.ncols)
+    start, end = tiles.cells[key]
+    core = tiles.order[start:end]
+    
+    halo_lat = max_distance / KM_PER_DEGREE
+    halo_lon = max_distance / (KM_PER_DEGREE * tiles._cos(tiles.max_abs_lat))
+    west = tiles.lon0 + tx * tiles.cell_lon - halo_lon
+    east = tiles.lon0 + (tx + 1) * tiles.cell_lon + halo_lon
+    south = tiles.lat0 + ty * tiles.cell_lat - halo_lat
+    north = tiles.lat0 + (ty + 1) * tiles.cell_lat + halo_lat
+    block = tiles._block(tx, ty, 1, 1)
+    inside = ((lons[block] >= west) & (lons[block] <= east) &
+              (lats[block] >= south) & (lats[block] <= north))
+    halo = block[inside]
+    halo = halo[~np.isin(halo, core)]
+    
+    local = np.concatenate([core, halo])
+    is_core = np.zeros(len(local), dtype=bool)
+    is_core[:len(core)] = True
+    index = SpatialGridIndex(lats[local], lons[local], cell_km=max_distance)
+    src, dst, dist = index.neighbor_pairs(max_distance, sources=is_core)
+    dst = local[dst]
+    order = np.argsort(src * len(lats) + dst)
+    src, dst, dist = src[order], dst[order], dist[order]
+    
+    counts = np.bincount(src, minlength=len(core))
+    return core, counts, dst.astype(np.int32), (1.0 / (1.0 + dist)).astype(np.float32)
+
+
+# Per-process state of graph-building workers: coordinates live in shared
+# memory attached once by the pool initializer, tasks only carry a tile key
+_tile_worker = {}
+
+
+def _init_tile_worker(shm_name, n, tile_km, max_distance):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    coords = np.ndarray((2, n), dtype=np.float64, buffer=shm.buf)
+    _tile_worker.update(
+        shm=shm,
+        lats=coords[0],
+        lons=coords[1],
+        tiles=SpatialGridIndex(coords[0], coords[1], cell_km=tile_km),
+        max_distance=max_distance,
+    )
+
+
+def _tile_block_task(key):
+    w = _tile_worker
+    return tile_block(w['lats'], w['lons'], w['tiles'], key, w['max_distance'])
+
+
+def iter_tile_blocks(lats, lons, max_distance, tile_km, workers=1):
+    """Yield tile_block results for every tile, always in tile-key order
+    
+    With workers > 1 tiles are computed in a process pool; the coordinate
+    arrays are copied once into shared memory instead of pickled per task.
+    """
+    tile_km = max(tile_km, max_distance)
+    tiles = SpatialGridIndex(lats, lons, cell_km=tile_km)
+    keys = list(tiles.cells)
+    print(f"🧩 Tiled build: {len(keys)} tiles of {tile_km:g} km, {workers} worker(s)")
+    
+    if workers <= 1 or len(keys) <= 1:
+        for key in keys:
+            yield tile_block(lats, lons, tiles, key, max_distance)
+        return
+    
+    n = len(lats)
+    shm = shared_memory.SharedMemory(create=True, size=2 * n * 8)
+    try:
+        coords = np.ndarray((2, n), dtype=np.float64, buffer=shm.buf)
+        coords[0], coords[1] = lats, lons
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_tile_worker,
+                                 initargs=(shm.name, n, tile_km, max_distance)) as pool:
+            yield from pool.map(_tile_block_task, keys)
+        del coords
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def parallel_tile_km(lats, lons, max_distance, workers, tiles_per_worker=8):
+    """Tile edge giving roughly tiles_per_worker tiles per worker over the bounding box"""
+    if not len(lats):
+        return max_distance
+    max_abs_lat = float(np.abs(lats).max())
+    width = (lons.max() - lons.min()) * KM_PER_DEGREE * SpatialGridIndex._cos(max_abs_lat)
+    height = (lats.max() - lats.min()) * KM_PER_DEGREE
+    return max(max_distance, math.sqrt(width * height / (workers * tiles_per_worker)))
+
 
 class TransportMOLAnalyzer:
     """Fast MOL analysis with optimizations"""
     
     def __init__(self):
         self.stations = []
+        self.zones = None
         
     def load_data(self, filename):
-        """Load transport data"""
+        """Load transport data (stations.csv or a GTFS feed) into a columnar StationStore"""
+        from transport_mol_gtfs import GTFSReader, is_gtfs_source
+        if is_gtfs_source(filename):
+            return GTFSReader(filename).read_stations()
+        
         print("🧠 Loading transport ontology...")
-        stations = []
-        with open(filename, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for i, row in enumerate(reader):
-                if i % 1000 == 0:
-                    print(f"📥 Loaded {i} stops...")
-                
-                coords = row['standort'].strip('"').split(',')
-                station = {
-                    'id': row['stop_id'],
-                    'name': row['stop_name'],
-                    'type': row['typ'],
-                    'lat': float(coords[0].strip()),
-                    'lon': float(coords[1].strip()),
-                    'lines': eval(row['in_linien']),
-                    'num_lines': len(eval(row['in_linien']))
-                }
-                stations.append(station)
-        
-        print(f"📊 Loaded {len(stations)} stops")
+        with open(filename, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            col = {name: k for k, name in enumerate(header)}
+            id_col, name_col, type_col = col['stop_id'], col['stop_name'], col['typ']
+            coord_col, lines_col = col['standort'], col['in_linien']
+            year_col = next((col[name] for name in YEAR_COLUMNS if name in col), None)
+            
+            stations = StationStore.build(
+                (row[id_col], row[name_col], row[type_col],
+                 *parse_standort(row[coord_col]), parse_line_list(row[lines_col]),
+                 parse_year(row[year_col]) if year_col is not None else 0)
+                for row in reader
+            )
+        
+        print(f"📊 Loaded {len(stations)} stops, {len(stations.line_names)} lines")
         return stations
     
+    def load_stations(self, filename, cache_root=None):
+        """Load stations through a persistent binary cache of the parsed columns
+        
+        The cache lives in <data dir>/.mol_cache/<path hash>/ and is keyed by
+        path, size, mtime and SHA-256 of the file. The hash is only recomputed
+        when size or mtime change, so a hit costs one stat and a few mmaps.
+        Any mismatch rebuilds the cache from load_data. GTFS directories are
+        not cached (zipped feeds are). When the cache cannot be written (a
+        read-only data directory) the parsed stations are returned uncached.
+        """
+        if os.path.isdir(filename):
+            return self.load_data(filename)
+        
+        path = os.path.abspath(filename)
+        cache_root = cache_root or os.path.join(os.path.dirname(path), STATION_CACHE_DIR)
+        cache_dir = os.path.join(cache_root, hashlib.sha1(path.encode('utf-8')).hexdigest()[:16])
+        meta_path = os.path.join(cache_dir, 'meta.json')
+        stat = os.stat(path)
+        key = {'version': STATION_CACHE_VERSION, 'path': path,
+               'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        
+        meta = None
+        if os.path.exists(meta_path):
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                meta = None
+        
+        if meta and meta.get('version') == STATION_CACHE_VERSION and meta.get('path') == path:
+            fresh = meta.get('size') == stat.st_size and meta.get('mtime_ns') == stat.st_mtime_ns
+            if not fresh and meta.get('size') == stat.st_size:
+                fresh = meta.get('sha256') == file_digest(path)
+                if fresh:
+                    try:
+                        self._write_cache_meta(meta_path, dict(meta, **key))
+                    except OSError:
+                        pass  # still valid; the hash is simply checked again next time
+            if fresh:
+                stations = StationStore.load(cache_dir)
+                print(f"⚡ Loaded {len(stations)} stops from cache {cache_dir}")
+                return stations
+        
+        stations = self.load_data(filename)
+        try:
+            self._replace_cache(cache_root, cache_dir, stations, dict(key, sha256=file_digest(path)))
+        except OSError as e:
+            print(f"⚠️ Station cache not written ({e}); continuing without it")
+            return stations
+        print(f"💾 Cached parsed stations in {cache_dir}")
+        return stations
+    
+    def _replace_cache(self, cache_root, cache_dir, stations, meta):
+        """Write a complete cache in a temporary directory under cache_root, then swap it in
+        
+        Files of the previous cache are never rewritten in place, so stores
+        still memory-mapped from them keep their contents.
+        """
+        os.makedirs(cache_root, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix='.build_', dir=cache_root)
+        try:
+            stations.save(tmp_dir)
+            self._write_cache_meta(os.path.join(tmp_dir, 'meta.json'), meta)
+            if os.path.exists(cache_dir):
+                stale_dir = tempfile.mkdtemp(prefix='.stale_', dir=cache_root)
+                os.replace(cache_dir, os.path.join(stale_dir, 'cache'))
+                shutil.rmtree(stale_dir, ignore_errors=True)
+            os.replace(tmp_dir, cache_dir)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+    
+    def _write_cache_meta(self, meta_path, meta):
+        """Atomically replace the cache metadata; it is written last and marks the cache valid"""
+        tmp_path = f'{meta_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+    
     def calculate_distance_fast(self, lat1, lon1, lat2, lon2):
         """Fast distance calculation"""
         dx = (lon2 - lon1) * 111.32 * math.cos(math.radians((lat1 + lat2) / 2))
         dy = (lat2 - lat1) * 111.32
         return math.sqrt(dx*dx + dy*dy)
     
-    def build_fast_graph(self, stations, max_distance=1.0, sample_size=5000):
-        """Fast graph construction"""
+    def build_fast_graph(self, stations, max_distance=1.0, tile_km=None, graph_dir=None, workers=1):
+        """Graph construction over a spatial grid index (exact neighbour sets)
+        
+        Networks above TILED_BUILD_THRESHOLD stops, or any network when tile_km
+        is given, are built tile by tile into a memory-mapped graph on disk.
+        workers > 1 builds tiles in a process pool. Without graph_dir the tiles
+        go to a temporary directory owned by the returned graph (see
+        TransportGraph.close); an explicit graph_dir is kept.
+        """
         print("🕸️ Building connection graph...")
         
-        if len(stations) > sample_size:
-            working_stations = stations[:sample_size]
-            print(f"🔍 Working with {sample_size} stops sample for speed")
+        if tile_km is not None or len(stations) > TILED_BUILD_THRESHOLD:
+            owned = graph_dir is None
+            if owned:
+                graph_dir = tempfile.mkdtemp(prefix='mol_graph_')
+            try:
+                self.build_tiled_graph(stations, max_distance, tile_km or DEFAULT_TILE_KM, graph_dir, workers)
+            except BaseException:
+                if owned:
+                    shutil.rmtree(graph_dir, ignore_errors=True)
+                raise
+            return TransportGraph.load(graph_dir, owned=owned), stations
+        
+        if workers > 1:
+            graph = self.build_parallel_graph(stations, max_distance, workers)
         else:
-            working_stations = stations
+            index = SpatialGridIndex(stations.lats, stations.lons, cell_km=max_distance)
+            src, dst, dist = index.neighbor_pairs(max_distance)
+            graph = TransportGraph.from_pairs(len(stations), src, dst, 1.0 / (1.0 + dist))
+        print(f"📊 Found {graph.num_edges} connections between {len(stations)} stops")
+        
+        return graph, stations
+    
+    def build_parallel_graph(self, stations, max_distance=1.0, workers=2, tile_km=None):
+        """In-memory graph build with tiles spread over a process pool
         
-        graph = {}
-        total = len(working_stations)
+        Tile blocks arrive in tile-key order and are scattered into their CSR
+        rows, so the result is identical to the single-process build.
+        """
+        lats, lons = stations.lats, stations.lons
+        tile_km = tile_km or parallel_tile_km(lats, lons, max_distance, workers)
+        blocks = list(iter_tile_blocks(lats, lons, max_distance, tile_km, workers))
         
-        for i, st1 in enumerate(working_stations):
-            if i % 500 == 0:
-                print(f"📊 Processed {i}/{total} stops...")
-            
-            graph[st1['id']] = []
-            
-            for j, st2 in enumerate(working_stations):
-                if i != j and j % 10 == 0:
-                    distance = self.calculate_distance_fast(st1['lat'], st1['lon'], st2['lat'], st2['lon'])
-                    if distance < max_distance:
-                        weight = 1.0 / (1.0 + distance)
-                        graph[st1['id']].append((st2['id'], weight))
+        degree = np.zeros(len(stations), dtype=np.int64)
+        for core, counts, _, _ in blocks:
+            degree[core] = counts
+        offsets = np.zeros(len(stations) + 1, dtype=np.int64)
+        np.cumsum(degree, out=offsets[1:])
         
-        return graph, working_stations
+        neighbors = np.empty(offsets[-1], dtype=np.int32)
+        weights = np.empty(offsets[-1], dtype=np.float32)
+        for core, counts, block_neighbors, block_weights in blocks:
+            block_start = np.concatenate([[0], np.cumsum(counts)[:-1]])
+            positions = np.repeat(offsets[core] - block_start, counts) + np.arange(len(block_neighbors))
+            neighbors[positions] = block_neighbors
+            weights[positions] = block_weights
+        
+        return TransportGraph(offsets, neighbors, weights)
+    
+    def build_tiled_graph(self, stations, max_distance=1.0, tile_km=DEFAULT_TILE_KM,
+                          graph_dir=None, workers=1):
+        """Tile-by-tile graph build with bounded memory
+        
+        The bounding box is cut into tile_km squares. Each tile is processed
+        together with a max_distance halo from its neighbours, and its rows are
+        appended to disk straight away. A final pass rewrites them as a
+        TransportGraph (offsets.npy, neighbors.npy, weights.npy) in graph_dir.
+        """
+        graph_dir = graph_dir or tempfile.mkdtemp(prefix='mol_graph_')
+        os.makedirs(graph_dir, exist_ok=True)
+        n = len(stations)
+        
+        row_start = np.zeros(n, dtype=np.int64)
+        degree = np.zeros(n, dtype=np.int64)
+        written = 0
+        dst_path = os.path.join(graph_dir, '_tiles_dst.bin')
+        weight_path = os.path.join(graph_dir, '_tiles_weights.bin')
+        
+        with open(dst_path, 'wb') as dst_file, open(weight_path, 'wb') as weight_file:
+            for core, counts, neighbors, weights in iter_tile_blocks(
+                    stations.lats, stations.lons, max_distance, tile_km, workers):
+                degree[core] = counts
+                row_start[core] = written + np.concatenate([[0], np.cumsum(counts)[:-1]])
+                neighbors.tofile(dst_file)
+                weights.tofile(weight_file)
+                written += len(neighbors)
+        
+        self._write_csr(graph_dir, row_start, degree, dst_path, weight_path)
+        os.remove(dst_path)
+        os.remove(weight_path)
+        print(f"📊 Found {written} connections between {n} stops → {graph_dir}")
+        return graph_dir
+    
+    def _write_csr(self, graph_dir, row_start, degree, dst_path, weight_path, chunk=65536):
+        """Reorder tile-ordered rows into CSR by stop index, one chunk of rows at a time"""
+        offsets = np.zeros(len(degree) + 1, dtype=np.int64)
+        np.cumsum(degree, out=offsets[1:])
+        total = int(offsets[-1])
+        np.save(os.path.join(graph_dir, 'offsets.npy'), offsets)
+        
+        if total == 0:
+            np.save(os.path.join(graph_dir, 'neighbors.npy'), np.empty(0, dtype=np.int32))
+            np.save(os.path.join(graph_dir, 'weights.npy'), np.empty(0, dtype=np.float32))
+            return
+        
+        tile_dst = np.memmap(dst_path, dtype=np.int32, mode='r', shape=(total,))
+        tile_weights = np.memmap(weight_path, dtype=np.float32, mode='r', shape=(total,))
+        neighbors = np.lib.format.open_memmap(os.path.join(graph_dir, 'neighbors.npy'),
+                                              mode='w+', dtype=np.int32, shape=(total,))
+        weights = np.lib.format.open_memmap(os.path.join(graph_dir, 'weights.npy'),
+                                            mode='w+', dtype=np.float32, shape=(total,))
+        
+        for first in range(0, len(degree), chunk):
+            last = min(first + chunk, len(degree))
+            counts = degree[first:last]
+            size = int(counts.sum())
+            if size == 0:
+                continue
+            # Position of every edge of these rows inside the tile-ordered files
+            row_base = np.repeat(row_start[first:last] - (offsets[first:last] - offsets[first]), counts)
+            source = row_base + np.arange(size)
+            neighbors[offsets[first]:offsets[last]] = tile_dst[source]
+            weights[offsets[first]:offsets[last]] = tile_weights[source]
+        
+        neighbors.flush()
+        weights.flush()
+        del tile_dst, tile_weights, neighbors, weights
     
     def calculate_O_E(self, station, graph):
         """Calculate ontological load O(ℰ)"""
-        station_id = station['id']
-        neighbors = graph.get(station_id, [])
+        actual_connections = graph.degree_of(station['index'])
         
-        if not neighbors:
-            return 0.5
+        if not actual_connections:
+            return O_E_ISOLATED
         
-        actual_connections = len(neighbors)
-        optimal_connections = min(station['num_lines'] * 2, 20)
+        optimal_connections = min(station['num_lines'] * 2, MAX_OPTIMAL_CONNECTIONS)
         
         connection_ratio = actual_connections / max(optimal_connections, 1)
         
-        if connection_ratio < 0.5:
-            O_E = 0.3  # Underloaded
-        elif connection_ratio > 2.0:
-            O_E = 0.8  # Overloaded
+        if connection_ratio < UNDERLOAD_RATIO:
+            O_E = O_E_UNDERLOADED
+        elif connection_ratio > OVERLOAD_RATIO:
+            O_E = O_E_OVERLOADED
         else:
-            O_E = 0.5  # Optimal
+            O_E = O_E_OPTIMAL
         
         return O_E
     
-    def analyze_network(self, data_file):
-        """Run complete MOL analysis"""
+    def sweep_max_distance(self, stations, radii=SWEEP_RADII):
+        """Degree and O(ℰ) for several max_distance values from one neighbour search
+        
+        Neighbours are found once at the largest radius. Each edge falls into
+        the ring between two consecutive radii, and a cumulative sum over
+        rings gives every stop's degree at every radius. The returned graph
+        keeps each stop's neighbours sorted by distance, so the first
+        degrees[i, k] of them are exactly its neighbours within radii[k].
+        """
+        radii = np.unique(np.asarray(radii, dtype=np.float64))
+        n, R = len(stations), len(radii)
+        print(f"📏 Sweeping max_distance over {', '.join(f'{r:g}' for r in radii)} km...")
+        
+        index = SpatialGridIndex(stations.lats, stations.lons, cell_km=radii[-1])
+        src, dst, dist = index.neighbor_pairs(radii[-1])
+        ring = np.searchsorted(radii, dist, side='right')
+        
+        # Sort each stop's neighbours by (ring, distance) with a single integer key;
+        # ring order is exact, distance order within a ring is to 2**-24 of the radius
+        fraction = np.minimum(dist / radii[-1] * (1 << 24), (1 << 24) - 1).astype(np.int64)
+        order = np.argsort(((src * R + ring) << 24) | fraction)
+        src, dst, dist, ring = src[order], dst[order], dist[order], ring[order]
+        graph = TransportGraph.from_pairs(n, src, dst, 1.0 / (1.0 + dist))
+        
+        counts = np.bincount(src * R + ring, minlength=n * R).reshape(n, R)
+        degrees = np.cumsum(counts, axis=1)
+        
+        num_lines = stations.num_lines
+        O_E = np.column_stack([calculate_O_E_batch(degrees[:, k], num_lines) for k in range(R)])
+        
+        summary = []
+        for k, radius in enumerate(radii):
+            column, degree = O_E[:, k], degrees[:, k]
+            isolated = int(np.count_nonzero(degree == 0))
+            optimal = int(np.count_nonzero(column <= MOL_OPTIMAL_MAX))
+            summary.append({
+                'max_distance': float(radius),
+                'mean_connections': float(degree.mean()) if n else 0.0,
+                'underloaded': int(np.count_nonzero(column == O_E_UNDERLOADED)),
+                'optimal': int(np.count_nonzero(column == O_E_OPTIMAL)) - isolated,
+                'overloaded': int(np.count_nonzero(column == O_E_OVERLOADED)),
+                'isolated': isolated,
+                'mol_optimal': optimal,
+                'problematic': int(np.count_nonzero(column >= MOL_PROBLEMATIC_MIN)),
+                'network_optimality': optimal / n * 100 if n else 0.0
+            })
+        
+        self.print_sweep(summary)
+        return {'radii': radii, 'degrees': degrees, 'O_E': O_E, 'graph': graph, 'summary': summary}
+    
+    def print_sweep(self, summary):
+        """Display per-radius sensitivity table"""
+        print(f"\n📏 MAX_DISTANCE SENSITIVITY:")
+        print("km | Avg conn | Under | Optimal | Over | Isolated | Optimality")
+        print("-" * 65)
+        for row in summary:
+            print(f"{row['max_distance']:4g} | {row['mean_connections']:8.1f} | "
+                  f"{row['underloaded']:5} | {row['optimal']:7} | {row['overloaded']:5} | "
+                  f"{row['isolated']:8} | {row['network_optimality']:.1f}%")
+    
+    def analyze_sweep(self, data_file, radii=SWEEP_RADII, use_cache=True):
+        """Run the max_distance sensitivity sweep on a data file"""
+        stations = self.load_stations(data_file) if use_cache else self.load_data(data_file)
+        return self.sweep_max_distance(stations, radii)
+    
+    def analyze_network(self, data_file, max_distance=1.0, tile_km=None, use_cache=True, workers=1,
+                        load_samples=0, output=None):
+        """Run complete MOL analysis over every stop
+        
+        Per-stop results stream through a TransportResultSink (optionally to
+        a .csv/.jsonl file given as output); the sink is returned.
+        load_samples > 0 adds each stop's approximate betweenness ('load')
+        from that many sampled BFS sources, see transport_mol_centrality.
+        """
         print("🚆 MOL TRANSPORT NETWORK ANALYSIS")
         print("=" * 50)
         
-        stations = self.load_data(data_file)
-        graph, working_stations = self.build_fast_graph(stations)
-        
-        print("\n📊 Calculating O(ℰ)...")
-        results = []
+        stations = self.load_stations(data_file) if use_cache else self.load_data(data_file)
+        graph, stations = self.build_fast_graph(stations, max_distance, tile_km, workers=workers)
         
-        for i, station in enumerate(working_stations):
-            if i % 1000 == 0:
-                print(f"🧮 Calculated O(ℰ) for {i} stops...")
+        with graph:
+            print("\n📊 Calculating O(ℰ)...")
+            degree = graph.degree()
+            num_lines = stations.num_lines
+            O_E = calculate_O_E_batch(degree, num_lines)
+            load = centrality = None
+            if load_samples:
+                from transport_mol_centrality import approximate_betweenness
+                print(f"🛰️ Estimating betweenness load from {load_samples} sources...")
+                centrality = approximate_betweenness(graph, load_samples, workers=workers)
+                load = centrality['betweenness']
             
-            O_E = self.calculate_O_E(station, graph)
+            with TransportResultSink(path=output) as sink:
+                for start in range(0, len(stations), RESULT_CHUNK):
+                    end = min(start + RESULT_CHUNK, len(stations))
+                    sink.add_chunk(stations, start, O_E[start:end], degree[start:end], num_lines[start:end],
+                                   None if load is None else load[start:end])
+            if output:
+                print(f"💾 Wrote {sink.count} per-stop rows to {output}")
             
-            results.append({
-                'stop_id': station['id'],
-                'stop_name': station['name'],
-                'type': station['type'],
-                'num_lines': station['num_lines'],
-                'lat': station['lat'],
-                'lon': station['lon'],
-                'O_E': O_E,
-                'connections': len(graph.get(station['id'], []))
-            })
+            from transport_mol_zones import find_mol_zones, print_zones
+            self.zones = find_mol_zones(graph, stations, O_E)
         
-        results.sort(key=lambda x: x['O_E'])
-        self.print_results(results)
+        self.print_results(sink)
+        if centrality is not None:
+            self.print_load(sink, centrality)
+        print_zones(self.zones)
         
-        return results
+        return sink
     
-    def print_results(self, results):
+    def print_results(self, sink):
         """Display results"""
         print(f"\n🏆 TOP 10 OPTIMAL STOPS (low O(ℰ)):")
         print("Stop | O(ℰ) | Lines | Connections | Type")
         print("-" * 55)
-        for item in results[:10]:
+        for item in sink.lowest_rows()[:10]:
             print(f"{item['stop_name'][:18]:18} | {item['O_E']:.3f} | "
                   f"{item['num_lines']:6} | {item['connections']:7} | {item['type']}")
         
         print(f"\n⚠️  TOP 10 OVERLOADED STOPS (high O(ℰ)):")
         print("Stop | O(ℰ) | Lines | Connections | Type")
         print("-" * 55)
-        for item in results[-10:]:
+        for item in sink.highest_rows()[-10:]:
             print(f"{item['stop_name'][:18]:18} | {item['O_E']:.3f} | "
                   f"{item['num_lines']:6} | {item['connections']:7} | {item['type']}")
         
-        # Statistics
-        O_E_values = [r['O_E'] for r in results]
-        optimal = len([r for r in results if r['O_E'] <= 0.35])
-        problematic = len([r for r in results if r['O_E'] >= 0.7])
-        
         print(f"\n📊 MOL STATISTICS:")
-        print(f"Optimal stops (O(ℰ) ≤ 0.35): {optimal}")
-        print(f"Problematic stops (O(ℰ) ≥ 0.7): {problematic}")
-        print(f"Network optimality: {optimal/len(results)*100:.1f}%")
+        print(f"Optimal stops (O(ℰ) ≤ 0.35): {sink.optimal}")
+        print(f"Problematic stops (O(ℰ) ≥ 0.7): {sink.problematic}")
+        print(f"Network optimality: {sink.network_optimality:.1f}%")
+
+    def print_load(self, sink, centrality):
+        """Display the stops carrying the most shortest paths"""
+        print(f"\n🛰️ TOP 10 LOADED STOPS (betweenness, ±{centrality['error_bound']:.4f} "
+              f"at {centrality['confidence']:.0%}, {centrality['samples']} sources):")
+        print("Stop | Load | O(ℰ) | Lines | Connections")
+        print("-" * 55)
+        for item in sink.most_loaded_rows()[:10]:
+            print(f"{item['stop_name'][:18]:18} | {item['load']:.4f} | {item['O_E']:.3f} | "
+                  f"{item['num_lines']:5} | {item['connections']:7}")
+
+
+def find_stations_file(paths=STATIONS_PATHS):
+    """First of paths that exists; None (after saying where to get the data) otherwise"""
+    for path in paths:
+        if os.path.exists(path):
+            return path
+    
+    print("\n❌ stations.csv not found!")
+    print("📥 Please download from: https://doi.org/10.5281/zenodo.17444654")
+    print("💡 And place in one of these locations:")
+    for path in paths:
+        print(f"   - {path}")
+    return None
+
 
 def main():
     """Main function with flexible data path"""
@@ -164,26 +1068,8 @@ def main():
     print("Dataset: Berlin Public Transport 1946-1989")
     print("DOI: 10.5281/zenodo.17444654")
     
-    # Try different possible data paths
-    possible_paths = [
-        'data/stations.csv',
-        '../data/stations.csv', 
-        'stations.csv',
-        './stations.csv'
-    ]
-    
-    data_file = None
-    for path in possible_paths:
-        if os.path.exists(path):
-            data_file = path
-            break
-    
+    data_file = find_stations_file()
     if not data_file:
-        print("\n❌ stations.csv not found!")
-        print("📥 Please download from: https://doi.org/10.5281/zenodo.17444654")
-        print("💡 And place in one of these locations:")
-        for path in possible_paths:
-            print(f"   - {path}")
         return
     
     print(f"✅ Using data file: {data_file}")
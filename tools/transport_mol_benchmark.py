@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+
+"""
+MOL Transport Benchmark
+Deterministic synthetic cities and per-stage scaling report
+Builds on transport_mol_analyzer.py
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+from transport_mol_analyzer import (
+    KM_PER_DEGREE, SpatialGridIndex, TransportMOLAnalyzer, calculate_O_E_batch,
+)
+
+CITY_CENTER = (52.52, 13.40)
+STOPS_PER_KM2 = 22.0  # Berlin: ~19,758 stops over ~900 km²
+STOPS_PER_CLUSTER = 400
+BACKGROUND_SHARE = 0.3
+LINE_STEP_KM = 0.6
+STOP_TYPES = ('autobus', 'straßenbahn', 's-bahn', 'u-bahn')
+
+
+def generate_city(num_stops, num_lines=None, seed=0, stops_per_line=30):
+    """Deterministic clustered stop layout with lines threaded through it
+    
+    Stops are drawn around Gaussian neighbourhood centres (plus a uniform
+    background share) at Berlin-like density. Each line starts at a random
+    stop and walks in a slowly turning direction, taking the nearest stop
+    around every LINE_STEP_KM step. Returns (lats, lons, types, stop_lines).
+    """
+    rng = np.random.default_rng(seed)
+    num_lines = num_lines if num_lines is not None else max(10, num_stops // 100)
+    radius_km = math.sqrt(num_stops / STOPS_PER_KM2 / math.pi)
+    
+    clusters = max(1, num_stops // STOPS_PER_CLUSTER)
+    centre_r = radius_km * np.sqrt(rng.random(clusters))
+    centre_a = rng.random(clusters) * 2 * math.pi
+    weights = rng.uniform(0.5, 1.5, clusters)
+    owner = rng.choice(clusters, size=num_stops, p=weights / weights.sum())
+    spread = rng.uniform(1.0, 2.0, clusters)[owner]
+    x = centre_r[owner] * np.cos(centre_a[owner]) + rng.normal(0, 1, num_stops) * spread
+    y = centre_r[owner] * np.sin(centre_a[owner]) + rng.normal(0, 1, num_stops) * spread
+    
+    background = rng.random(num_stops) < BACKGROUND_SHARE
+    r = radius_km * np.sqrt(rng.random(background.sum()))
+    a = rng.random(background.sum()) * 2 * math.pi
+    x[background], y[background] = r * np.cos(a), r * np.sin(a)
+    
+    lat0, lon0 = CITY_CENTER
+    lats = lat0 + y / KM_PER_DEGREE
+    lons = lon0 + x / (KM_PER_DEGREE * math.cos(math.radians(lat0)))
+    types = rng.integers(0, len(STOP_TYPES), num_stops)
+    
+    index = SpatialGridIndex(lats, lons, cell_km=LINE_STEP_KM)
+    stop_lines = [[] for _ in range(num_stops)]
+    for line in range(num_lines):
+        current = int(rng.integers(num_stops))
+        heading = rng.random() * 2 * math.pi
+        for _ in range(stops_per_line):
+            if not stop_lines[current] or stop_lines[current][-1] != line:
+                stop_lines[current].append(line)
+            heading += rng.normal(0, 0.25)
+            step_lat = lats[current] + LINE_STEP_KM * math.sin(heading) / KM_PER_DEGREE
+            step_lon = lons[current] + LINE_STEP_KM * math.cos(heading) / (
+                KM_PER_DEGREE * math.cos(math.radians(lats[current])))
+            near, dist = index.query_radius(step_lat, step_lon, LINE_STEP_KM / 2)
+            if not len(near):
+                heading += math.pi / 2
+                continue
+            current = int(near[np.argmin(dist)])
+    
+    return lats, lons, types, stop_lines
+
+
+def write_stations_csv(path, lats, lons, types, stop_lines):
+    """Write a synthetic city in the Berlin stations.csv schema"""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['stop_id', 'stop_name', 'typ', 'standort', 'in_linien'])
+        for i, (lat, lon, kind, lines) in enumerate(zip(lats.tolist(), lons.tolist(),
+                                                        types.tolist(), stop_lines)):
+            writer.writerow([f'syn{i}', f'Synthetic {i}', STOP_TYPES[kind],
+                             f'{lat:.6f}, {lon:.6f}', repr([f'L{line}' for line in lines])])
+
+
+def _reset_peak_rss():
+    """Reset the kernel's peak-RSS mark where supported (Linux)"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class StageTimer:
+    """Collect wall time, peak RSS and throughput for named pipeline stages"""
+    
+    def __init__(self):
+        self.records = []
+    
+    def run(self, size, stage, items, fn, *args, **kwargs):
+        per_stage_peak = _reset_peak_rss()
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        seconds = time.perf_counter() - start
+        self.records.append({
+            'stops': size,
+            'stage': stage,
+            'seconds': seconds,
+            'peak_rss_mb': _peak_rss_mb(),
+            'peak_rss_scope': 'stage' if per_stage_peak else 'process',
+            'items': items,
+            'items_per_second': items / seconds if seconds > 0 else float('inf'),
+        })
+        r = self.records[-1]
+        print(f"⏱️ {size:>8} | {stage:18} | {seconds:8.3f} s | {r['peak_rss_mb']:8.1f} MB | "
+              f"{r['items_per_second']:12.0f} /s")
+        return result
+
+
+def run_benchmark(sizes, num_lines=None, max_distance=1.0, seed=0, workdir=None):
+    """Time load_data, load_stations, build_fast_graph and calculate_O_E_batch per size"""
+    analyzer = TransportMOLAnalyzer()
+    timer = StageTimer()
+    cleanup = workdir is None
+    workdir = workdir or tempfile.mkdtemp(prefix='mol_bench_')
+    
+    try:
+        records = _run_sizes(analyzer, timer, sizes, num_lines, max_distance, seed, workdir)
+    finally:
+        if cleanup:
+            shutil.rmtree(workdir, ignore_errors=True)
+    
+    return {
+        'generated': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'max_distance': max_distance,
+        'seed': seed,
+        'records': records,
+    }
+
+
+def _run_sizes(analyzer, timer, sizes, num_lines, max_distance, seed, workdir):
+    for size in sizes:
+        lats, lons, types, stop_lines = generate_city(size, num_lines, seed)
+        path = os.path.join(workdir, f'stations_{size}.csv')
+        write_stations_csv(path, lats, lons, types, stop_lines)
+        
+        stations = timer.run(size, 'load_data', size, analyzer.load_data, path)
+        timer.run(size, 'cache_build', size, analyzer.load_stations, path)
+        stations = timer.run(size, 'cache_load', size, analyzer.load_stations, path)
+        graph, _ = timer.run(size, 'build_fast_graph', size, analyzer.build_fast_graph,
+                             stations, max_distance)
+        with graph:
+            timer.run(size, 'calculate_O_E', size, calculate_O_E_batch, graph.degree(), stations.num_lines)
+            timer.records[-1]['edges'] = graph.num_edges
+    return timer.records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MOL transport pipeline scaling benchmark")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--lines', type=int, default=None, help="lines per city (default: stops / 100)")
+    parser.add_argument('--max-distance', type=float, default=1.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='transport_benchmark.json')
+    args = parser.parse_args()
+    
+    print("\n🔬 MOL FOUNDATION - TRANSPORT PIPELINE BENCHMARK")
+    report = run_benchmark(args.sizes, args.lines, args.max_distance, args.seed)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+"""
+MOL Transport Centrality
+Approximate betweenness load for overloaded-stop detection
+Builds on transport_mol_analyzer.py
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+DEFAULT_SAMPLES = 256
+DEFAULT_DELTA = 0.05
+
+
+def samples_for_error(n, epsilon, delta=DEFAULT_DELTA):
+    """Sources needed so every stop's estimate is within epsilon with probability 1 - delta"""
+    return min(n, int(math.ceil(math.log(2 * max(n, 1) / delta) / (2 * epsilon * epsilon))))
+
+
+def error_bound(n, samples, delta=DEFAULT_DELTA):
+    """Hoeffding + union bound on the normalized betweenness error for all n stops"""
+    if samples >= n:
+        return 0.0
+    return math.sqrt(math.log(2 * max(n, 1) / delta) / (2 * samples))
+
+
+def source_dependencies(offsets, neighbors, sources):
+    """Sum of Brandes dependencies δ_s(v) over the given sources (unweighted, hop paths)
+    
+    Each BFS level is expanded and back-propagated as whole arrays, so the
+    work per source is a handful of NumPy passes over its reachable edges.
+    """
+    n = len(offsets) - 1
+    degree = np.diff(offsets)
+    total = np.zeros(n, dtype=np.float64)
+    
+    for s in sources:
+        dist = np.full(n, -1, dtype=np.int32)
+        sigma = np.zeros(n, dtype=np.float64)
+        dist[s], sigma[s] = 0, 1.0
+        frontier = np.array([s], dtype=np.int64)
+        levels = []
+        depth = 0
+        
+        while len(frontier):
+            counts = degree[frontier]
+            base = np.repeat(offsets[frontier] - np.concatenate([[0], np.cumsum(counts)[:-1]]), counts)
+            v = np.repeat(frontier, counts)
+            w = neighbors[base + np.arange(counts.sum())].astype(np.int64)
+            
+            fresh = np.unique(w[dist[w] < 0])
+            dist[fresh] = depth + 1
+            on_path = dist[w] == depth + 1
+            v, w = v[on_path], w[on_path]
+            sigma += np.bincount(w, weights=sigma[v], minlength=n)
+            levels.append((v, w))
+            frontier = fresh
+            depth += 1
+        
+        delta = np.zeros(n, dtype=np.float64)
+        for v, w in reversed(levels):
+            delta += np.bincount(v, weights=sigma[v] / sigma[w] * (1.0 + delta[w]), minlength=n)
+        delta[s] = 0.0
+        total += delta
+    
+    return total
+
+
+# Per-process state of centrality workers: the CSR arrays are attached from
+# shared memory once per worker, tasks only carry a batch of source ids
+_centrality_worker = {}
+
+
+def _init_centrality_worker(offsets_name, neighbors_name, n, num_edges, neighbors_dtype):
+    offsets_shm = shared_memory.SharedMemory(name=offsets_name)
+    neighbors_shm = shared_memory.SharedMemory(name=neighbors_name)
+    _centrality_worker.update(
+        shms=(offsets_shm, neighbors_shm),
+        offsets=np.ndarray((n + 1,), dtype=np.int64, buffer=offsets_shm.buf),
+        neighbors=np.ndarray((num_edges,), dtype=neighbors_dtype, buffer=neighbors_shm.buf),
+    )
+
+
+def _centrality_task(sources):
+    w = _centrality_worker
+    return source_dependencies(w['offsets'], w['neighbors'], sources)
+
+
+def approximate_betweenness(graph, samples=DEFAULT_SAMPLES, delta=DEFAULT_DELTA,
+                            workers=1, seed=0, batches_per_worker=4):
+    """Sampled-source Brandes betweenness on a TransportGraph
+    
+    Sources are drawn uniformly without replacement. The result is normalized
+    to [0, 1] (fraction of ordered stop pairs whose shortest paths pass
+    through a stop) and, with probability 1 - delta, every stop is within
+    error_bound of its exact value. samples >= n gives exact betweenness.
+    Source batches are spread over a process pool when workers > 1.
+    """
+    offsets = np.ascontiguousarray(graph.offsets, dtype=np.int64)
+    neighbors = np.ascontiguousarray(graph.neighbors)
+    n = len(offsets) - 1
+    samples = min(int(samples), n)
+    sources = np.random.default_rng(seed).choice(n, size=samples, replace=False) if samples < n \
+        else np.arange(n)
+    
+    if workers <= 1 or samples < 2:
+        total = source_dependencies(offsets, neighbors, sources)
+    else:
+        batches = np.array_split(sources, min(samples, workers * batches_per_worker))
+        offsets_shm = shared_memory.SharedMemory(create=True, size=max(offsets.nbytes, 1))
+        neighbors_shm = shared_memory.SharedMemory(create=True, size=max(neighbors.nbytes, 1))
+        try:
+            np.ndarray(offsets.shape, dtype=offsets.dtype, buffer=offsets_shm.buf)[:] = offsets
+            np.ndarray(neighbors.shape, dtype=neighbors.dtype, buffer=neighbors_shm.buf)[:] = neighbors
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_centrality_worker,
+                                     initargs=(offsets_shm.name, neighbors_shm.name, n,
+                                               len(neighbors), neighbors.dtype)) as pool:
+                total = np.zeros(n, dtype=np.float64)
+                # Summed in batch order so the result does not depend on scheduling
+                for part in pool.map(_centrality_task, batches):
+                    total += part
+        finally:
+            for shm in (offsets_shm, neighbors_shm):
+                shm.close()
+                shm.unlink()
+    
+    scale = samples * (n - 1) if n > 1 else 1
+    return {
+        'betweenness': total / scale,
+        'samples': samples,
+        'error_bound': error_bound(n, samples, delta),
+        'confidence': 1 - delta,
+    }
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+
+"""
+MOL Transport GTFS Reader
+Streams a GTFS feed (directory or .zip) into a StationStore
+Builds on transport_mol_analyzer.py
+"""
+
+import csv
+import io
+import os
+import sys
+import zipfile
+
+import numpy as np
+
+from transport_mol_analyzer import StationStore, TransportMOLAnalyzer
+from transport_mol_lines import LineTopology
+
+STOP_TIMES_CHUNK_ROWS = 1000000
+
+ROUTE_TYPE_NAMES = {
+    0: 'tram', 1: 'subway', 2: 'rail', 3: 'bus', 4: 'ferry', 5: 'cable_tram',
+    6: 'aerial_lift', 7: 'funicular', 11: 'trolleybus', 12: 'monorail',
+}
+
+
+def is_gtfs_source(path):
+    """A .zip file or a directory that contains stops.txt"""
+    if os.path.isdir(path):
+        return os.path.exists(os.path.join(path, 'stops.txt'))
+    return zipfile.is_zipfile(path) if os.path.isfile(path) else False
+
+
+class GTFSReader:
+    """Streaming GTFS reader deriving each stop's serving lines
+    
+    stops.txt, routes.txt and trips.txt are read whole (they are small);
+    stop_times.txt is walked in chunks of chunk_rows rows and only the set
+    of distinct (stop, route) pairs is kept, so memory is bounded by the
+    network size rather than by the number of scheduled stop events.
+    A line is a route, named by route_short_name (route_id if empty).
+    The running order of each route's longest trip is kept as well, for
+    line_topology.
+    """
+    
+    def __init__(self, source, chunk_rows=STOP_TIMES_CHUNK_ROWS):
+        self.source = source
+        self.chunk_rows = chunk_rows
+        self.route_sequences = {}  # route index → stop indices of its longest trip
+        self.route_names = []
+    
+    def _open(self, name):
+        if os.path.isdir(self.source):
+            return open(os.path.join(self.source, name), 'r', encoding='utf-8-sig', newline='')
+        archive = zipfile.ZipFile(self.source)
+        member = next((m for m in archive.namelist() if m.rsplit('/', 1)[-1] == name), None)
+        if member is None:
+            archive.close()
+            raise FileNotFoundError(f"{name} not found in {self.source}")
+        return io.TextIOWrapper(archive.open(member), encoding='utf-8-sig', newline='')
+    
+    def _rows(self, name):
+        with self._open(name) as f:
+            reader = csv.reader(f)
+            header = [column.strip() for column in next(reader)]
+            col = {column: k for k, column in enumerate(header)}
+            for row in reader:
+                if row:
+                    yield col, row
+    
+    def read_stations(self):
+        """Parse the feed into a StationStore with one row per stop"""
+        print(f"🧠 Loading GTFS feed {self.source}...")
+        stops = []
+        stop_index = {}
+        for col, row in self._rows('stops.txt'):
+            location_type = row[col['location_type']].strip() if 'location_type' in col else ''
+            if location_type not in ('', '0'):
+                continue
+            stop_index[row[col['stop_id']]] = len(stops)
+            stops.append((row[col['stop_id']], row[col['stop_name']],
+                          float(row[col['stop_lat']]), float(row[col['stop_lon']])))
+        
+        route_index, route_names, route_types = {}, [], []
+        for col, row in self._rows('routes.txt'):
+            route_index[row[col['route_id']]] = len(route_names)
+            short = row[col['route_short_name']].strip() if 'route_short_name' in col else ''
+            route_names.append(short or row[col['route_id']])
+            route_type = row[col['route_type']].strip() if 'route_type' in col else ''
+            route_types.append(int(route_type) if route_type.isdigit() else 3)
+        self.route_names = route_names
+        
+        trip_route = {}
+        for col, row in self._rows('trips.txt'):
+            route = route_index.get(row[col['route_id']])
+            if route is not None:
+                trip_route[row[col['trip_id']]] = route
+        
+        self.route_sequences = {}
+        pairs = self._serving_pairs(stop_index, trip_route, len(route_names))
+        R = max(len(route_names), 1)
+        pair_stops, pair_routes = np.divmod(pairs, R)
+        counts = np.bincount(pair_stops, minlength=len(stops))
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+        route_types = np.array(route_types, dtype=np.int64)
+        
+        def rows():
+            for i, (stop_id, name, lat, lon) in enumerate(stops):
+                routes = pair_routes[offsets[i]:offsets[i + 1]]
+                mode = int(route_types[routes].min()) if len(routes) else -1
+                station_type = ROUTE_TYPE_NAMES.get(mode, f'route_type_{mode}' if mode >= 0 else 'unserved')
+                yield stop_id, name, station_type, lat, lon, [route_names[r] for r in routes], 0
+        
+        stations = StationStore.build(rows())
+        print(f"📊 Loaded {len(stations)} stops, {len(stations.line_names)} lines from GTFS")
+        return stations
+    
+    def line_topology(self, stations):
+        """LineTopology in true running order, one line per route served by a trip
+        
+        Call after read_stations; stops are indexed by the rows of its StationStore.
+        """
+        routes = sorted(self.route_sequences)
+        return LineTopology.from_sequences(len(stations), [self.route_sequences[r] for r in routes],
+                                           [self.route_names[r] for r in routes])
+    
+    def _serving_pairs(self, stop_index, trip_route, num_routes):
+        """Sorted distinct stop * num_routes + route codes from stop_times.txt, chunk by chunk
+        
+        Also keeps, per route, the stop order of its longest trip as
+        self.route_sequences. Rows of one trip are normally contiguous and are
+        ordered as each trip ends; if a trip_id turns up again after other
+        trips, the file is read a second time for just the longest trips.
+        """
+        R = max(num_routes, 1)
+        pairs = np.empty(0, dtype=np.int64)
+        chunk = []
+        seen = 0
+        trip, trip_stops = None, []
+        trip_rows = {}  # trip_id → usable stop_times rows
+        grouped = True
+        
+        def close_trip():
+            if trip is not None and trip_route.get(trip) is not None and trip_stops:
+                route = trip_route[trip]
+                ordered = [stop for _, stop in sorted(trip_stops)]
+                if len(ordered) > len(self.route_sequences.get(route, ())):
+                    self.route_sequences[route] = ordered
+        
+        for col, row in self._rows('stop_times.txt'):
+            trip_id = row[col['trip_id']]
+            stop = stop_index.get(row[col['stop_id']])
+            route = trip_route.get(trip_id)
+            
+            if trip_id != trip:
+                close_trip()
+                grouped = grouped and trip_id not in trip_rows
+                trip, trip_stops = trip_id, []
+                trip_rows.setdefault(trip_id, 0)
+            if stop is None or route is None:
+                continue
+            trip_rows[trip_id] += 1
+            if grouped:
+                trip_stops.append((int(row[col['stop_sequence']]), stop))
+            chunk.append(stop * R + route)
+            
+            if len(chunk) >= self.chunk_rows:
+                pairs = np.union1d(pairs, np.array(chunk, dtype=np.int64))
+                seen += len(chunk)
+                chunk = []
+                print(f"📥 Streamed {seen} stop_times rows...")
+        
+        if grouped:
+            close_trip()
+        else:
+            print("⚠️ stop_times.txt is not grouped by trip_id; re-reading it for route running order")
+            self.route_sequences = self._longest_trips(stop_index, trip_route, trip_rows)
+        return np.union1d(pairs, np.array(chunk, dtype=np.int64))
+    
+    def _longest_trips(self, stop_index, trip_route, trip_rows):
+        """Stop order of each route's longest trip, buffering only those trips' rows"""
+        longest = {}
+        for trip_id, count in trip_rows.items():
+            route = trip_route.get(trip_id)
+            if route is None or not count:
+                continue
+            if route not in longest or count > trip_rows[longest[route]]:
+                longest[route] = trip_id
+        route_of = {trip_id: route for route, trip_id in longest.items()}
+        
+        trip_stops = {trip_id: [] for trip_id in route_of}
+        for col, row in self._rows('stop_times.txt'):
+            stops = trip_stops.get(row[col['trip_id']])
+            stop = stop_index.get(row[col['stop_id']])
+            if stops is not None and stop is not None:
+                stops.append((int(row[col['stop_sequence']]), stop))
+        return {route: [stop for _, stop in sorted(trip_stops[trip_id])] for trip_id, route in route_of.items()}
+
+def main():
+    """Run the standard transport analysis on a GTFS feed"""
+    if len(sys.argv) < 2:
+        print("Usage: python transport_mol_gtfs.py <gtfs.zip | gtfs directory>")
+        return
+    
+    print("\n🔬 MOL FOUNDATION - TRANSPORT NETWORK ANALYSIS (GTFS)")
+    TransportMOLAnalyzer().analyze_network(sys.argv[1])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+
+"""
+MOL Transport Incremental Engine
+What-if analysis: O(ℰ) updates for added, moved and removed stops
+Builds on transport_mol_analyzer.py
+"""
+
+import itertools
+import math
+
+import numpy as np
+
+from transport_mol_analyzer import (
+    KM_PER_DEGREE, MOL_OPTIMAL_MAX, MOL_PROBLEMATIC_MIN,
+    SpatialGridIndex, TransportMOLAnalyzer, calculate_O_E_batch, fast_distance_km, find_stations_file,
+)
+
+
+class IncrementalTransportMOL:
+    """Keeps degree, O(ℰ) and network counters current under single-stop edits
+    
+    Stops live in a mutable lat/lon cell grid sized to max_distance. An edit
+    only queries the cells around the stop, adjusts the degree of the stops
+    within max_distance and re-scores just those, so its cost depends on the
+    local density rather than on the size of the network.
+    """
+    
+    def __init__(self, stations, max_distance=1.0, graph=None):
+        n = len(stations)
+        self.max_distance = float(max_distance)
+        self.size = n
+        self.lats = np.array(stations.lats, dtype=np.float64)
+        self.lons = np.array(stations.lons, dtype=np.float64)
+        self.num_lines = np.array(stations.num_lines, dtype=np.int64)
+        self.alive = np.ones(n, dtype=bool)
+        self.ids = [str(station_id) for station_id in stations.ids]
+        
+        if graph is None:
+            index = SpatialGridIndex(self.lats, self.lons, cell_km=self.max_distance)
+            src, _, _ = index.neighbor_pairs(self.max_distance)
+            self.degree = np.bincount(src, minlength=n).astype(np.int64)
+        else:
+            self.degree = np.array(graph.degree(), dtype=np.int64)
+        self.O_E = calculate_O_E_batch(self.degree, self.num_lines)
+        
+        self.ref_lat = float(np.abs(self.lats).max()) if n else 0.0
+        self.cell_lat = self.max_distance / KM_PER_DEGREE
+        self.cell_lon = self.max_distance / (KM_PER_DEGREE * SpatialGridIndex._cos(self.ref_lat))
+        self.cells = {}
+        cx = np.floor(self.lons / self.cell_lon).astype(np.int64)
+        cy = np.floor(self.lats / self.cell_lat).astype(np.int64)
+        for i, key in enumerate(zip(cx.tolist(), cy.tolist())):
+            self.cells.setdefault(key, set()).add(i)
+        
+        self.optimal = int(np.count_nonzero(self.O_E <= MOL_OPTIMAL_MAX))
+        self.problematic = int(np.count_nonzero(self.O_E >= MOL_PROBLEMATIC_MIN))
+        self.stops = n
+    
+    def _cell(self, lat, lon):
+        return int(math.floor(lon / self.cell_lon)), int(math.floor(lat / self.cell_lat))
+    
+    def _within(self, lat, lon, exclude=None):
+        """Live stops strictly closer than max_distance to (lat, lon)"""
+        # A neighbour can sit up to max_distance further from the equator,
+        # which widens the longitude span that has to be scanned
+        far_lat = max(abs(lat) + self.cell_lat, self.ref_lat)
+        rx = max(1, int(math.ceil(self.max_distance / (KM_PER_DEGREE * SpatialGridIndex._cos(far_lat))
+                                  / self.cell_lon)))
+        cx, cy = self._cell(lat, lon)
+        found = [self.cells.get((x, y), ()) for y in range(cy - 1, cy + 2)
+                 for x in range(cx - rx, cx + rx + 1)]
+        cand = np.fromiter(itertools.chain.from_iterable(found), dtype=np.int64)
+        if exclude is not None:
+            cand = cand[cand != exclude]
+        dist = fast_distance_km(lat, lon, self.lats[cand], self.lons[cand])
+        return cand[dist < self.max_distance]
+    
+    def _rescore(self, idx):
+        """Recompute O(ℰ) for idx and move them between the counters"""
+        old = self.O_E[idx]
+        new = calculate_O_E_batch(self.degree[idx], self.num_lines[idx])
+        self.optimal += int(np.count_nonzero(new <= MOL_OPTIMAL_MAX)) - int(np.count_nonzero(old <= MOL_OPTIMAL_MAX))
+        self.problematic += (int(np.count_nonzero(new >= MOL_PROBLEMATIC_MIN))
+                             - int(np.count_nonzero(old >= MOL_PROBLEMATIC_MIN)))
+        self.O_E[idx] = new
+    
+    def _grow(self):
+        capacity = max(16, 2 * len(self.lats))
+        for name in ('lats', 'lons', 'num_lines', 'alive', 'degree', 'O_E'):
+            old = getattr(self, name)
+            grown = np.zeros(capacity, dtype=old.dtype)
+            grown[:len(old)] = old
+            setattr(self, name, grown)
+    
+    def _check(self, i):
+        if not (0 <= i < self.size and self.alive[i]):
+            raise KeyError(f"No live stop with index {i}")
+    
+    def neighbors(self, i):
+        """Indices of the live stops within max_distance of stop i"""
+        self._check(i)
+        return self._within(self.lats[i], self.lons[i], exclude=i)
+    
+    def add_stop(self, lat, lon, num_lines, stop_id=None):
+        """Insert a stop and return its index"""
+        if self.size == len(self.lats):
+            self._grow()
+        i = self.size
+        self.size += 1
+        self.ids.append(stop_id if stop_id is not None else f"new-{i}")
+        
+        near = self._within(lat, lon)
+        self.lats[i], self.lons[i] = lat, lon
+        self.num_lines[i] = num_lines
+        self.alive[i] = True
+        self.cells.setdefault(self._cell(lat, lon), set()).add(i)
+        
+        self.degree[near] += 1
+        self.degree[i] = len(near)
+        # Count the new stop as "optimal" first so _rescore moves it correctly
+        self.O_E[i] = 0.5
+        self.stops += 1
+        self._rescore(np.append(near, i))
+        return i
+    
+    def remove_stop(self, i):
+        """Delete stop i; its neighbours lose one connection"""
+        self._check(i)
+        near = self.neighbors(i)
+        self.cells[self._cell(self.lats[i], self.lons[i])].discard(i)
+        
+        self.degree[near] -= 1
+        self._rescore(near)
+        # Take the stop itself out of the counters
+        old = self.O_E[i]
+        self.optimal -= int(old <= MOL_OPTIMAL_MAX)
+        self.problematic -= int(old >= MOL_PROBLEMATIC_MIN)
+        self.alive[i] = False
+        self.O_E[i] = np.nan
+        self.degree[i] = 0
+        self.stops -= 1
+    
+    def move_stop(self, i, lat, lon):
+        """Relocate stop i, updating the neighbourhoods it leaves and joins"""
+        self._check(i)
+        before = self.neighbors(i)
+        self.cells[self._cell(self.lats[i], self.lons[i])].discard(i)
+        after = self._within(lat, lon)
+        self.lats[i], self.lons[i] = lat, lon
+        self.cells.setdefault(self._cell(lat, lon), set()).add(i)
+        
+        self.degree[before] -= 1
+        self.degree[after] += 1
+        self.degree[i] = len(after)
+        self._rescore(np.union1d(np.union1d(before, after), [i]))
+    
+    def set_num_lines(self, i, num_lines):
+        """Change how many lines serve stop i (only its own O(ℰ) moves)"""
+        self._check(i)
+        self.num_lines[i] = num_lines
+        self._rescore(np.array([i]))
+    
+    def summary(self):
+        return {
+            'stops': self.stops,
+            'optimal': self.optimal,
+            'problematic': self.problematic,
+            'network_optimality': self.optimal / self.stops * 100 if self.stops else 0.0
+        }
+    
+    def print_summary(self, label):
+        s = self.summary()
+        print(f"{label:24} | {s['stops']:6} stops | optimal {s['optimal']:5} | "
+              f"problematic {s['problematic']:5} | {s['network_optimality']:.1f}%")
+
+
+def main():
+    """Remove the busiest stop and add one in its place, showing the O(ℰ) deltas"""
+    print("\n🔬 MOL FOUNDATION - TRANSPORT WHAT-IF ANALYSIS")
+    
+    data_file = find_stations_file()
+    if not data_file:
+        return
+    
+    analyzer = TransportMOLAnalyzer()
+    stations = analyzer.load_stations(data_file)
+    graph, _ = analyzer.build_fast_graph(stations)
+    engine = IncrementalTransportMOL(stations, graph=graph)
+    engine.print_summary("Baseline")
+    
+    busiest = int(np.argmax(engine.degree[:engine.size]))
+    lat, lon = engine.lats[busiest], engine.lons[busiest]
+    engine.remove_stop(busiest)
+    engine.print_summary(f"Without {stations.names[busiest][:14]}")
+    engine.add_stop(lat, lon, num_lines=int(stations.num_lines[busiest]) + 2)
+    engine.print_summary("Rebuilt with +2 lines")
+
+
+if __name__ == "__main__":
+    main()
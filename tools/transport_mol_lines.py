@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+
+"""
+MOL Transport Line Topology
+Line-connectivity graph from an inverted line → ordered stops index
+Builds on transport_mol_analyzer.py
+"""
+
+import math
+import sys
+
+import numpy as np
+
+from transport_mol_analyzer import KM_PER_DEGREE, TransportMOLAnalyzer, calculate_O_E_batch, find_stations_file
+
+
+def chain_order(x, y):
+    """Visiting order of one line's stops (planar km) by nearest-neighbour chaining
+    
+    The chain starts at the stop farthest from the centroid, an end on open
+    lines, and repeats its first stop at the end (a ring line) when the gap
+    back to it is no longer than the longest step of the chain (the ends of
+    an open line lie farther apart). Quadratic in the stops of one line,
+    which stays small.
+    """
+    k = len(x)
+    if k < 3:
+        return np.arange(k)
+    left = np.ones(k, dtype=bool)
+    current = int(np.argmax((x - x.mean()) ** 2 + (y - y.mean()) ** 2))
+    order = [current]
+    left[current] = False
+    for _ in range(k - 1):
+        dist = np.where(left, (x - x[current]) ** 2 + (y - y[current]) ** 2, np.inf)
+        current = int(np.argmin(dist))
+        order.append(current)
+        left[current] = False
+    steps = np.hypot(np.diff(x[order]), np.diff(y[order]))
+    gap = math.hypot(x[order[-1]] - x[order[0]], y[order[-1]] - y[order[0]])
+    if k >= 4 and gap <= steps.max():
+        order.append(order[0])
+    return np.array(order, dtype=np.int64)
+
+
+class LineTopology:
+    """Stop graph in which two stops are adjacent when consecutive on some line
+    
+    line_stops[line_offsets[l]:line_offsets[l + 1]] are the stops of line l in
+    running order. Every derived array is computed with sorts and bincounts,
+    so cost is linear in line membership, not quadratic.
+    """
+    
+    def __init__(self, num_stops, line_offsets, line_stops, line_names=None):
+        self.num_stops = num_stops
+        self.line_offsets = line_offsets
+        self.line_stops = line_stops
+        self.line_names = line_names
+        
+        # Consecutive pairs on each line, as undirected segments
+        nxt = np.arange(1, len(line_stops))
+        same_line = np.ones(len(nxt), dtype=bool)
+        starts = line_offsets[1:-1]
+        same_line[starts[(starts > 0) & (starts < len(line_stops))] - 1] = False
+        a, b = line_stops[nxt - 1][same_line], line_stops[nxt][same_line]
+        keep = a != b
+        lo, hi = np.minimum(a[keep], b[keep]), np.maximum(a[keep], b[keep])
+        
+        segments, multiplicity = np.unique(lo.astype(np.int64) * num_stops + hi, return_counts=True)
+        self.segment_a, self.segment_b = np.divmod(segments, num_stops)
+        self.segment_lines = multiplicity
+        
+        # Symmetric CSR adjacency over unique segments
+        src = np.concatenate([self.segment_a, self.segment_b])
+        dst = np.concatenate([self.segment_b, self.segment_a])
+        lines = np.concatenate([multiplicity, multiplicity])
+        order = np.argsort(src * num_stops + dst)
+        self.offsets = np.zeros(num_stops + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=num_stops), out=self.offsets[1:])
+        self.neighbors = dst[order].astype(np.int32)
+        self.neighbor_lines = lines[order]
+    
+    @classmethod
+    def from_stations(cls, stations, order='chain'):
+        """Invert the station → lines CSR of a StationStore into line → stops
+        
+        stations.csv does not record running order, so by default each line's
+        stops are chained nearest-neighbour first from the stop farthest from
+        the line's centroid (see chain_order); a line whose ends meet like a
+        ring is closed into a loop, its first stop repeated at the end.
+        order='axis' sorts along the line's principal axis instead (right only
+        for straight routes: it folds rings and U-shapes), order='file' keeps
+        source row order. GTFS feeds record the real order, see
+        GTFSReader.line_topology. Use a single-year slice (StationStore.take)
+        for stacked snapshots.
+        """
+        n = len(stations)
+        stops = np.repeat(np.arange(n, dtype=np.int64), stations.num_lines)
+        lines = np.asarray(stations.line_indices, dtype=np.int64)
+        num_lines = len(stations.line_names)
+        x = y = np.empty(0)
+        if len(stops):
+            x = np.asarray(stations.lons)[stops] * KM_PER_DEGREE * math.cos(
+                math.radians(float(np.mean(stations.lats))))
+            y = np.asarray(stations.lats)[stops] * KM_PER_DEGREE
+        line_offsets = np.zeros(num_lines + 1, dtype=np.int64)
+        np.cumsum(np.bincount(lines, minlength=num_lines), out=line_offsets[1:])
+        
+        if order == 'chain':
+            by_line = np.argsort(lines, kind='stable')
+            sequences = []
+            for line in range(num_lines):
+                members = by_line[line_offsets[line]:line_offsets[line + 1]]
+                sequences.append(stops[members[chain_order(x[members], y[members])]])
+            return cls.from_sequences(n, sequences, stations.line_names)
+        
+        if order == 'axis' and len(stops):
+            size = np.maximum(np.bincount(lines, minlength=num_lines), 1)
+            mx = np.bincount(lines, x, num_lines) / size
+            my = np.bincount(lines, y, num_lines) / size
+            dx, dy = x - mx[lines], y - my[lines]
+            sxx = np.bincount(lines, dx * dx, num_lines)
+            syy = np.bincount(lines, dy * dy, num_lines)
+            sxy = np.bincount(lines, dx * dy, num_lines)
+            theta = 0.5 * np.arctan2(2 * sxy, sxx - syy)
+            position = dx * np.cos(theta[lines]) + dy * np.sin(theta[lines])
+            by_position = np.argsort(position, kind='stable')
+            ranking = by_position[np.argsort(lines[by_position], kind='stable')]
+        elif order in ('axis', 'file'):
+            ranking = np.argsort(lines, kind='stable')
+        else:
+            raise ValueError("order must be 'chain', 'axis' or 'file'")
+        
+        return cls(n, line_offsets, stops[ranking], stations.line_names)
+    
+    @classmethod
+    def from_sequences(cls, num_stops, sequences, line_names=None):
+        """Build from an iterable of per-line stop index sequences in running order"""
+        sequences = [np.asarray(seq, dtype=np.int64) for seq in sequences]
+        line_offsets = np.zeros(len(sequences) + 1, dtype=np.int64)
+        np.cumsum([len(seq) for seq in sequences], out=line_offsets[1:])
+        line_stops = np.concatenate(sequences) if sequences else np.empty(0, dtype=np.int64)
+        return cls(num_stops, line_offsets, line_stops, line_names)
+    
+    def stops_of(self, line):
+        return self.line_stops[self.line_offsets[line]:self.line_offsets[line + 1]]
+    
+    def transfer_degree(self):
+        """Distinct stops reachable in one hop along any line"""
+        return np.diff(self.offsets)
+    
+    def line_overlap(self):
+        """Most lines sharing any one segment at each stop (corridor bundling)"""
+        overlap = np.zeros(self.num_stops, dtype=np.int64)
+        np.maximum.at(overlap, self.segment_a, self.segment_lines)
+        np.maximum.at(overlap, self.segment_b, self.segment_lines)
+        return overlap
+    
+    def line_O_E(self, num_lines):
+        """Topological O(ℰ): line-graph degree against the 2 × lines optimum"""
+        return calculate_O_E_batch(self.transfer_degree(), num_lines)
+    
+    def hops_from(self, source, max_hops=None):
+        """Hop distance from source to every stop (-1 when unreachable)"""
+        hops = np.full(self.num_stops, -1, dtype=np.int32)
+        hops[source] = 0
+        frontier = np.array([source], dtype=np.int64)
+        level = 0
+        
+        while len(frontier) and (max_hops is None or level < max_hops):
+            level += 1
+            starts, counts = self.offsets[frontier], np.diff(self.offsets)[frontier]
+            base = np.repeat(starts - np.concatenate([[0], np.cumsum(counts)[:-1]]), counts)
+            reached = self.neighbors[base + np.arange(counts.sum())]
+            reached = np.unique(reached[hops[reached] < 0])
+            hops[reached] = level
+            frontier = reached
+        
+        return hops
+    
+    def hop_distance(self, a, b):
+        """Fewest line segments between stops a and b (-1 when disconnected)"""
+        return int(self.hops_from(a)[b])
+
+
+def main():
+    print("\n🔬 MOL FOUNDATION - TRANSPORT LINE TOPOLOGY")
+    
+    data_file = sys.argv[1] if len(sys.argv) > 1 else find_stations_file()
+    if not data_file:
+        return
+    
+    from transport_mol_gtfs import GTFSReader, is_gtfs_source
+    if is_gtfs_source(data_file):
+        reader = GTFSReader(data_file)
+        stations = reader.read_stations()
+        topology = reader.line_topology(stations)
+    else:
+        stations = TransportMOLAnalyzer().load_stations(data_file)
+        latest = np.asarray(stations.years).max()
+        if latest > 0:
+            stations = stations.take(np.nonzero(np.asarray(stations.years) == latest)[0])
+            print(f"📅 Using the {latest} snapshot")
+        topology = LineTopology.from_stations(stations)
+    
+    transfer = topology.transfer_degree()
+    overlap = topology.line_overlap()
+    line_O_E = topology.line_O_E(stations.num_lines)
+    
+    print(f"\n🧭 LINE TOPOLOGY: {len(topology.line_offsets) - 1} lines, {len(topology.segment_a)} segments")
+    print("Stop | Lines | Transfer degree | Overlap | Line O(ℰ)")
+    print("-" * 60)
+    for i in np.argsort(-transfer, kind='stable')[:10]:
+        print(f"{stations.names[i][:18]:18} | {stations.num_lines[i]:5} | {transfer[i]:15} | "
+              f"{overlap[i]:7} | {line_O_E[i]:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+
+"""
+MOL Transport Query Server
+Long-lived local service answering O(ℰ) point, radius and bbox queries
+Builds on transport_mol_analyzer.py
+"""
+
+import argparse
+import json
+import os
+import socketserver
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from transport_mol_analyzer import (
+    MOL_OPTIMAL_MAX, MOL_PROBLEMATIC_MIN, SpatialGridIndex, StationStore, TransportMOLAnalyzer,
+    calculate_O_E_batch,
+)
+
+STATE_VERSION = 1
+DEFAULT_POINT_RADIUS = 0.5  # km searched for the nearest stop
+DEFAULT_LIMIT = 1000
+QUERY_TYPES = ('stop', 'point', 'radius', 'bbox')
+
+
+def precompute_state(data_file, state_dir, max_distance=1.0):
+    """Load a network, compute O(ℰ) once and save stations, degree and O(ℰ) to state_dir"""
+    analyzer = TransportMOLAnalyzer()
+    stations = analyzer.load_stations(data_file)
+    graph, stations = analyzer.build_fast_graph(stations, max_distance)
+    with graph:
+        degree = graph.degree()
+    
+    stations.save(state_dir)
+    np.save(os.path.join(state_dir, 'degree.npy'), degree)
+    np.save(os.path.join(state_dir, 'O_E.npy'), calculate_O_E_batch(degree, stations.num_lines))
+    stat = os.stat(data_file)
+    with open(os.path.join(state_dir, 'state.json'), 'w', encoding='utf-8') as f:
+        json.dump({'version': STATE_VERSION, 'source': os.path.abspath(data_file),
+                   'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                   'max_distance': max_distance}, f)
+    print(f"💾 Saved query state for {len(stations)} stops to {state_dir}")
+
+
+def state_is_fresh(data_file, state_dir, max_distance):
+    """True when state_dir was precomputed from the current data_file at max_distance"""
+    try:
+        with open(os.path.join(state_dir, 'state.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        stat = os.stat(data_file)
+    except (OSError, ValueError):
+        return False
+    return (meta.get('version') == STATE_VERSION and meta.get('size') == stat.st_size
+            and meta.get('mtime_ns') == stat.st_mtime_ns and meta.get('max_distance') == max_distance)
+
+
+class TransportQueryIndex:
+    """In-memory stations, spatial grid and O(ℰ) vector answering dashboard queries"""
+    
+    def __init__(self, stations, O_E, degree, cell_km=0.5):
+        self.stations = stations
+        self.O_E = np.asarray(O_E, dtype=np.float64)
+        self.degree = np.asarray(degree)
+        self.num_lines = np.asarray(stations.num_lines)
+        self.index = SpatialGridIndex(stations.lats, stations.lons, cell_km=cell_km)
+        
+        # Stop ids repeat across platforms; an id maps to all of its rows
+        self.by_id = {}
+        for i, stop_id in enumerate(stations.ids.tolist()):
+            self.by_id.setdefault(str(stop_id), []).append(i)
+    
+    @classmethod
+    def load(cls, state_dir, cell_km=0.5):
+        """Open a state directory written by precompute_state"""
+        stations = StationStore.load(state_dir, mmap_mode=None)
+        O_E = np.load(os.path.join(state_dir, 'O_E.npy'))
+        degree = np.load(os.path.join(state_dir, 'degree.npy'))
+        return cls(stations, O_E, degree, cell_km)
+    
+    def row(self, i, distance=None):
+        s = self.stations
+        row = {
+            'index': int(i),
+            'stop_id': str(s.ids[i]),
+            'stop_name': str(s.names[i]),
+            'type': str(s.type_names[s.type_codes[i]]),
+            'lat': float(s.lats[i]),
+            'lon': float(s.lons[i]),
+            'num_lines': int(self.num_lines[i]),
+            'connections': int(self.degree[i]),
+            'O_E': float(self.O_E[i]),
+        }
+        if distance is not None:
+            row['distance_km'] = float(distance)
+        return row
+    
+    def _filter(self, hits, min_O_E=None, max_O_E=None):
+        if min_O_E is not None:
+            hits = hits[self.O_E[hits] >= min_O_E]
+        if max_O_E is not None:
+            hits = hits[self.O_E[hits] <= max_O_E]
+        return hits
+    
+    def stop(self, stop_id):
+        """All rows sharing stop_id"""
+        return [self.row(i) for i in self.by_id.get(str(stop_id), [])]
+    
+    def point(self, lat, lon, radius=DEFAULT_POINT_RADIUS):
+        """Nearest stop to (lat, lon) within radius km, or None"""
+        hits, dist = self.index.query_radius(lat, lon, radius)
+        if not len(hits):
+            return None
+        best = np.argmin(dist)
+        return self.row(hits[best], dist[best])
+    
+    def radius(self, lat, lon, radius, min_O_E=None, max_O_E=None, limit=DEFAULT_LIMIT):
+        """Stops within radius km, nearest first, optionally filtered by O(ℰ)"""
+        hits, dist = self.index.query_radius(lat, lon, radius)
+        keep = np.ones(len(hits), dtype=bool)
+        if min_O_E is not None:
+            keep &= self.O_E[hits] >= min_O_E
+        if max_O_E is not None:
+            keep &= self.O_E[hits] <= max_O_E
+        hits, dist = hits[keep], dist[keep]
+        order = np.lexsort((hits, dist))[:limit]
+        return {'count': int(len(hits)), 'stops': [self.row(hits[k], dist[k]) for k in order]}
+    
+    def bbox(self, south, west, north, east, min_O_E=None, max_O_E=None, limit=DEFAULT_LIMIT):
+        """Stops inside the box, highest O(ℰ) first, optionally filtered by O(ℰ)"""
+        hits = self._filter(self.index.query_bbox(south, west, north, east), min_O_E, max_O_E)
+        order = np.lexsort((hits, -self.O_E[hits]))[:limit]
+        return {'count': int(len(hits)), 'stops': [self.row(hits[k]) for k in order]}
+    
+    def query(self, kind, params):
+        """Dispatch one query given as a type name and a parameter dict"""
+        if kind not in QUERY_TYPES:
+            raise ValueError(f"unknown query type {kind!r}")
+        if kind == 'stop':
+            return self.stop(params['id'])
+        
+        def number(name, default=None, required=True):
+            value = params.get(name, default)
+            if value is None and required:
+                raise ValueError(f"missing parameter {name!r} for {kind} query")
+            return None if value is None else float(value)
+        
+        if kind == 'point':
+            return self.point(number('lat'), number('lon'), number('radius', DEFAULT_POINT_RADIUS))
+        
+        bounds = number('min_O_E', required=False), number('max_O_E', required=False)
+        limit = int(params.get('limit', DEFAULT_LIMIT))
+        if kind == 'radius':
+            return self.radius(number('lat'), number('lon'), number('radius'), *bounds, limit)
+        return self.bbox(number('south'), number('west'), number('north'), number('east'), *bounds, limit)
+    
+    def batch(self, queries):
+        """Answer a list of {'type': ..., **params} queries; errors are reported per query"""
+        results = []
+        for q in queries:
+            if not isinstance(q, dict):
+                results.append({'error': 'query must be an object'})
+                continue
+            try:
+                results.append({'result': self.query(q.get('type'), q)})
+            except (KeyError, TypeError, ValueError) as e:
+                results.append({'error': f"{type(e).__name__}: {e}"})
+        return results
+    
+    def stats(self):
+        return {
+            'stops': len(self.stations),
+            'mean_O_E': float(self.O_E.mean()) if len(self.O_E) else 0.0,
+            'optimal': int((self.O_E <= MOL_OPTIMAL_MAX).sum()),
+            'problematic': int((self.O_E >= MOL_PROBLEMATIC_MIN).sum()),
+        }
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    """GET /stop, /point, /radius, /bbox, /stats and POST /batch, all answered in JSON"""
+    
+    protocol_version = 'HTTP/1.1'
+    
+    def address_string(self):
+        # Unix socket peers have no (host, port) address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+    
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+    
+    def _send(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _answer(self, fn):
+        start = time.perf_counter()
+        try:
+            result = fn()
+        except (KeyError, TypeError, ValueError) as e:
+            self._send(400, {'error': f"{type(e).__name__}: {e}"})
+            return
+        self._send(200, {'result': result, 'elapsed_ms': (time.perf_counter() - start) * 1000})
+    
+    def do_GET(self):
+        url = urlparse(self.path)
+        kind = url.path.strip('/')
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        if kind == 'stats':
+            self._answer(self.server.index.stats)
+        elif kind in QUERY_TYPES:
+            self._answer(lambda: self.server.index.query(kind, params))
+        else:
+            self._send(404, {'error': f"unknown endpoint /{kind}"})
+    
+    def do_POST(self):
+        if urlparse(self.path).path.strip('/') != 'batch':
+            self._send(404, {'error': f"unknown endpoint {self.path}"})
+            return
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            queries = json.loads(self.rfile.read(length) or b'[]')
+        except ValueError as e:
+            self._send(400, {'error': f"invalid JSON: {e}"})
+            return
+        if not isinstance(queries, list):
+            self._send(400, {'error': "batch body must be a JSON list of queries"})
+            return
+        self._answer(lambda: self.server.index.batch(queries))
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP over a Unix domain socket"""
+    
+    daemon_threads = True
+    
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+        socketserver.UnixStreamServer.server_bind(self)
+
+
+def make_server(index, host='127.0.0.1', port=8765, socket_path=None, verbose=False):
+    """HTTP server bound to host:port, or to socket_path when given"""
+    if socket_path:
+        server = UnixHTTPServer(socket_path, QueryHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), QueryHandler)
+    server.index = index
+    server.verbose = verbose
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MOL transport O(ℰ) query server")
+    parser.add_argument('data_file', nargs='?', default='stations.csv')
+    parser.add_argument('--state', default=None, help="precomputed state directory")
+    parser.add_argument('--max-distance', type=float, default=1.0)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--socket', default=None, help="serve on a Unix socket instead of TCP")
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+    
+    state_dir = args.state or os.path.join(os.path.dirname(os.path.abspath(args.data_file)),
+                                           '.mol_cache', 'query_state')
+    if not state_is_fresh(args.data_file, state_dir, args.max_distance):
+        precompute_state(args.data_file, state_dir, args.max_distance)
+    
+    index = TransportQueryIndex.load(state_dir)
+    server = make_server(index, args.host, args.port, args.socket, args.verbose)
+    where = args.socket or f"http://{args.host}:{args.port}"
+    print(f"🚀 Serving O(ℰ) for {len(index.stations)} stops on {where}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Stopped")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+
+"""
+MOL Transport Temporal Analysis
+O(ℰ) for every year of the Berlin network 1946-1989
+Builds on transport_mol_analyzer.py and transport_mol_incremental.py
+"""
+
+
+import numpy as np
+
+from transport_mol_analyzer import TransportMOLAnalyzer, find_stations_file
+from transport_mol_incremental import IncrementalTransportMOL
+
+REBUILD_FRACTION = 0.3  # rebuild from scratch when more stops than this change at once
+
+
+class TemporalTransportMOL:
+    """Year-sliced O(ℰ) over stations that carry a snapshot year
+    
+    Rows are grouped into periods of `period` years; within a period the
+    latest row of each stop (matched by stop_id or by name) is its state.
+    Each period starts from the previous period's incremental engine and
+    applies only the stops that appeared, disappeared, moved or changed
+    their line count. A full rebuild happens only when the diff is large.
+    """
+    
+    def __init__(self, stations, max_distance=1.0, key='stop_id', period=1):
+        if key not in ('stop_id', 'name'):
+            raise ValueError("key must be 'stop_id' or 'name'")
+        years = np.asarray(stations.years)
+        if not np.any(years > 0):
+            raise ValueError("stations have no snapshot years (jahr/year column)")
+        
+        self.stations = stations
+        self.max_distance = max_distance
+        self.period = period
+        self.years = years
+        identity = stations.ids if key == 'stop_id' else stations.names
+        self.identities, self.ident = np.unique(np.asarray(identity), return_inverse=True)
+    
+    def slices(self):
+        """Yield (period label, rows) with the latest row of each stop in the period"""
+        rows = np.nonzero(self.years > 0)[0]
+        labels = self.years[rows] // self.period * self.period
+        order = np.lexsort((self.years[rows], labels))
+        rows, labels = rows[order], labels[order]
+        bounds = np.flatnonzero(np.diff(labels)) + 1
+        
+        for chunk in np.split(rows, bounds):
+            latest_first = chunk[::-1]
+            _, first = np.unique(self.ident[latest_first], return_index=True)
+            yield int(self.years[chunk[0]] // self.period * self.period), np.sort(latest_first[first])
+    
+    def _active_lines(self, rows):
+        stations = self.stations
+        counts = stations.num_lines[rows]
+        starts = np.repeat(stations.line_offsets[rows] - np.concatenate([[0], np.cumsum(counts)[:-1]]), counts)
+        return len(np.unique(stations.line_indices[starts + np.arange(counts.sum())]))
+    
+    def run(self):
+        """Compute every period; returns {'table': columns, 'series': stops × periods, ...}"""
+        stations = self.stations
+        num_lines = stations.num_lines
+        slot = np.full(len(self.identities), -1, dtype=np.int64)
+        engine = None
+        
+        slices = list(self.slices())
+        series = np.full((len(self.identities), len(slices)), np.nan, dtype=np.float32)
+        columns = ('period', 'stops', 'lines', 'optimal', 'problematic', 'network_optimality',
+                   'mean_O_E', 'added', 'removed', 'changed', 'rebuilt')
+        table = {name: [] for name in columns}
+        
+        for k, (label, rows) in enumerate(slices):
+            cur = self.ident[rows]
+            present = np.zeros(len(self.identities), dtype=bool)
+            present[cur] = True
+            removed = np.nonzero((slot >= 0) & ~present)[0]
+            is_new = slot[cur] < 0
+            
+            kept_rows, kept_slots = rows[~is_new], slot[cur[~is_new]]
+            if engine is not None and len(kept_rows):
+                moved = ((engine.lats[kept_slots] != stations.lats[kept_rows]) |
+                         (engine.lons[kept_slots] != stations.lons[kept_rows]))
+                relined = engine.num_lines[kept_slots] != num_lines[kept_rows]
+            else:
+                moved = relined = np.zeros(len(kept_rows), dtype=bool)
+            
+            changes = len(removed) + int(is_new.sum()) + int(np.count_nonzero(moved | relined))
+            rebuilt = engine is None or changes > REBUILD_FRACTION * max(len(rows), 1)
+            
+            if rebuilt:
+                engine = IncrementalTransportMOL(stations.take(rows), self.max_distance)
+                slot[:] = -1
+                slot[cur] = np.arange(len(rows))
+            else:
+                for ident in removed:
+                    engine.remove_stop(int(slot[ident]))
+                    slot[ident] = -1
+                for row, i in zip(kept_rows[moved], kept_slots[moved]):
+                    engine.move_stop(int(i), stations.lats[row], stations.lons[row])
+                for row, i in zip(kept_rows[relined], kept_slots[relined]):
+                    engine.set_num_lines(int(i), int(num_lines[row]))
+                for row in rows[is_new]:
+                    slot[self.ident[row]] = engine.add_stop(stations.lats[row], stations.lons[row],
+                                                            int(num_lines[row]), str(stations.ids[row]))
+            
+            values = engine.O_E[slot[cur]]
+            series[cur, k] = values
+            summary = engine.summary()
+            table['period'].append(label)
+            table['stops'].append(summary['stops'])
+            table['lines'].append(self._active_lines(rows))
+            table['optimal'].append(summary['optimal'])
+            table['problematic'].append(summary['problematic'])
+            table['network_optimality'].append(summary['network_optimality'])
+            table['mean_O_E'].append(float(values.mean()) if len(values) else np.nan)
+            table['added'].append(int(is_new.sum()))
+            table['removed'].append(len(removed))
+            table['changed'].append(int(np.count_nonzero(moved | relined)))
+            table['rebuilt'].append(rebuilt)
+        
+        table = {name: np.array(values) for name, values in table.items()}
+        self.print_table(table)
+        return {'table': table, 'series': series, 'identities': self.identities,
+                'periods': table['period']}
+    
+    def print_table(self, table):
+        """Display per-period statistics"""
+        print(f"\n📅 O(ℰ) BY PERIOD:")
+        print("Year | Stops | Lines | Optimal | Problematic | Optimality | Avg O(ℰ) | +/-/~")
+        print("-" * 80)
+        for k in range(len(table['period'])):
+            diff = "rebuilt" if table['rebuilt'][k] else \
+                f"+{table['added'][k]}/-{table['removed'][k]}/~{table['changed'][k]}"
+            print(f"{table['period'][k]} | {table['stops'][k]:5} | {table['lines'][k]:5} | "
+                  f"{table['optimal'][k]:7} | {table['problematic'][k]:11} | "
+                  f"{table['network_optimality'][k]:9.1f}% | {table['mean_O_E'][k]:.3f} | {diff}")
+
+
+def main():
+    print("\n🔬 MOL FOUNDATION - TRANSPORT NETWORK HISTORY")
+    print("Dataset: Berlin Public Transport 1946-1989")
+    
+    data_file = find_stations_file()
+    if not data_file:
+        return
+    
+    stations = TransportMOLAnalyzer().load_stations(data_file)
+    try:
+        TemporalTransportMOL(stations).run()
+    except ValueError as e:
+        print(f"❌ {e}")
+
+
+if __name__ == "__main__":
+    main()
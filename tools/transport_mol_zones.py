@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+
+"""
+MOL Transport Zones
+Union-find clustering of contiguous overloaded and optimal stops
+Builds on transport_mol_analyzer.py
+"""
+
+import numpy as np
+
+from transport_mol_analyzer import MOL_OPTIMAL_MAX, MOL_PROBLEMATIC_MIN
+
+
+def union_find_components(n, src, dst):
+    """Connected-component root of every node, via array union-find
+    
+    Each round compresses every path to its root by pointer jumping, then
+    hooks the larger root of each crossing edge under the smaller one.
+    Rounds repeat until no edge joins two different roots; in practice a
+    few rounds suffice, each a linear pass over the edges.
+    """
+    parent = np.arange(n, dtype=np.int64)
+    src = np.asarray(src, dtype=np.int64)
+    dst = np.asarray(dst, dtype=np.int64)
+    
+    while True:
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                break
+            parent = grand
+        
+        ru, rv = parent[src], parent[dst]
+        crossing = ru != rv
+        if not crossing.any():
+            return parent
+        src, dst = src[crossing], dst[crossing]
+        low = np.minimum(ru[crossing], rv[crossing])
+        high = np.maximum(ru[crossing], rv[crossing])
+        np.minimum.at(parent, high, low)
+
+
+def selected_edges(graph, selected, chunk=65536):
+    """Edges (src < dst) with both ends selected, read from the CSR one chunk of rows at a time
+    
+    Only the kept edges are materialised, so a memory-mapped graph is never
+    loaded whole; chunks without a selected stop are not read at all.
+    """
+    offsets = graph.offsets
+    src_parts, dst_parts = [], []
+    for first in range(0, len(graph), chunk):
+        last = min(first + chunk, len(graph))
+        if not selected[first:last].any():
+            continue
+        bounds = np.asarray(offsets[first:last + 1], dtype=np.int64)
+        src = np.repeat(np.arange(first, last, dtype=np.int64), np.diff(bounds))
+        dst = np.asarray(graph.neighbors[bounds[0]:bounds[-1]], dtype=np.int64)
+        keep = selected[src] & selected[dst] & (src < dst)
+        src_parts.append(src[keep])
+        dst_parts.append(dst[keep])
+    if not src_parts:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    return np.concatenate(src_parts), np.concatenate(dst_parts)
+
+
+def find_zones(graph, stations, O_E, selected, kind):
+    """Contiguous zones of selected stops joined by graph edges, largest first"""
+    src, dst = selected_edges(graph, selected)
+    roots = union_find_components(len(graph), src, dst)
+    
+    members = np.nonzero(selected)[0]
+    labels, zone_of, sizes = np.unique(roots[members], return_inverse=True, return_counts=True)
+    lats, lons = np.asarray(stations.lats)[members], np.asarray(stations.lons)[members]
+    
+    count = len(labels)
+    lat_min = np.full(count, np.inf)
+    lat_max = np.full(count, -np.inf)
+    lon_min = np.full(count, np.inf)
+    lon_max = np.full(count, -np.inf)
+    np.minimum.at(lat_min, zone_of, lats)
+    np.maximum.at(lat_max, zone_of, lats)
+    np.minimum.at(lon_min, zone_of, lons)
+    np.maximum.at(lon_max, zone_of, lons)
+    lat_mean = np.bincount(zone_of, lats, count) / np.maximum(sizes, 1)
+    lon_mean = np.bincount(zone_of, lons, count) / np.maximum(sizes, 1)
+    mean_O_E = np.bincount(zone_of, O_E[members], count) / np.maximum(sizes, 1)
+    
+    grouped = np.split(members[np.argsort(zone_of, kind='stable')], np.cumsum(sizes)[:-1])
+    
+    zones = []
+    for k in np.argsort(-sizes, kind='stable'):
+        zones.append({
+            'kind': kind,
+            'size': int(sizes[k]),
+            'centroid': (float(lat_mean[k]), float(lon_mean[k])),
+            'bbox': (float(lat_min[k]), float(lon_min[k]), float(lat_max[k]), float(lon_max[k])),
+            'mean_O_E': float(mean_O_E[k]),
+            'stops': grouped[k],
+        })
+    return zones
+
+
+def find_mol_zones(graph, stations, O_E):
+    """Overloaded (O(ℰ) ≥ 0.7) and optimal (O(ℰ) ≤ 0.35) zones of the network"""
+    O_E = np.asarray(O_E)
+    return {
+        'overloaded': find_zones(graph, stations, O_E, O_E >= MOL_PROBLEMATIC_MIN, 'overloaded'),
+        'optimal': find_zones(graph, stations, O_E, O_E <= MOL_OPTIMAL_MAX, 'optimal'),
+    }
+
+
+def print_zones(zones, limit=5):
+    """Display the largest zones of each kind"""
+    for kind, title in (('overloaded', "⚠️  LARGEST OVERLOADED ZONES (O(ℰ) ≥ 0.7)"),
+                        ('optimal', "🏆 LARGEST OPTIMAL ZONES (O(ℰ) ≤ 0.35)")):
+        print(f"\n{title}: {len(zones[kind])} zones")
+        print("Stops | Centroid | Bounding box")
+        print("-" * 70)
+        for zone in zones[kind][:limit]:
+            lat, lon = zone['centroid']
+            south, west, north, east = zone['bbox']
+            print(f"{zone['size']:5} | {lat:.4f}, {lon:.4f} | "
+                  f"{south:.4f}, {west:.4f} → {north:.4f}, {east:.4f}")